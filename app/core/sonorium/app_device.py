@@ -522,6 +522,8 @@ class SonoriumApp:
         self.master_volume = max(0.0, min(1.0, volume))
         if self._mixer:
             self._mixer.master_volume = self.master_volume
+        for theme in self.themes:
+            theme.set_output_gain(self.master_volume)
         logger.debug(f'Volume set to: {self.master_volume}')
 
     def get_status(self) -> dict:
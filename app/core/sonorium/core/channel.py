@@ -320,6 +320,10 @@ class Channel:
         self._theme_stream = new_stream
         self._chunk_generator = new_generator
 
+        # Release the old theme stream (unregisters it from its theme)
+        if old_generator:
+            old_generator.close()
+
         logger.info(f"Channel {self.id}: Crossfade complete")
 
     def stop(self) -> None:
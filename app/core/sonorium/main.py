@@ -64,6 +64,19 @@ def clear_recovery_state(config_dir: Path):
         logger.info("Cleared recovery state")
 
 
+def install_uvloop() -> bool:
+    """Use uvloop as the asyncio event loop if available (Linux/macOS only)."""
+    if sys.platform == 'win32':
+        return False
+    try:
+        import uvloop
+    except ImportError:
+        return False
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    logger.info('Using uvloop event loop')
+    return True
+
+
 def run_server(host: str = '0.0.0.0', port: int = 8008, open_browser: bool = True):
     """Run the Sonorium web server."""
     import uvicorn
@@ -114,6 +127,9 @@ def run_server(host: str = '0.0.0.0', port: int = 8008, open_browser: bool = Tru
         audio_path=Path(config.audio_path)
     )
 
+    # Faster event loop for plugin I/O (imports, speaker control), if installed
+    use_uvloop = install_uvloop()
+
     # Initialize plugins asynchronously
     async def init_plugins():
         await plugin_manager.initialize()
@@ -137,7 +153,13 @@ def run_server(host: str = '0.0.0.0', port: int = 8008, open_browser: bool = Tru
     logger.info(f'Starting Sonorium server at http://{host}:{port}')
 
     # Run server
-    uvicorn.run(fastapi_app, host=host, port=port, log_level='info')
+    uvicorn.run(
+        fastapi_app,
+        host=host,
+        port=port,
+        log_level='info',
+        loop='uvloop' if use_uvloop else 'asyncio'
+    )
 
 
 def run_with_tray(host: str = '0.0.0.0', port: int = 8008):
@@ -27,6 +27,11 @@ class BasePlugin(ABC):
         version: str - Semantic version (e.g., "1.0.0")
         description: str - Brief description
         author: str - Plugin author
+
+    The loader uses the manifest's "plugin_class" to find the class. Without
+    one, a module can name its plugin explicitly with a module-level
+    ``__plugin__ = MyPlugin``; otherwise the first BasePlugin subclass
+    defined in plugin.py is used.
     """
 
     # Override these in your plugin
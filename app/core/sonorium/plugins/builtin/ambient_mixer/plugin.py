@@ -20,6 +20,7 @@ from __future__ import annotations
 
 import asyncio
 import hashlib
+import io
 import json
 import re
 import uuid
@@ -38,6 +39,26 @@ USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
 XML_API_BASE = "http://xml.ambient-mixer.com/audio-template?player=html5&id_template="
 AUDIO_EXTENSIONS = {'.mp3', '.wav', '.ogg', '.flac', '.m4a'}
 
+# Sanitizer tables: str.translate handles the common ASCII case without regex
+_FOLDER_BAD_CHARS = str.maketrans('', '', '<>:"/\\|?*')
+_FILENAME_ASCII_DROP = str.maketrans('', '', ''.join(
+    c for c in map(chr, range(128))
+    if not (c.isalnum() or c.isspace() or c in '_-')
+))
+_WHITESPACE_RE = re.compile(r'\s+')
+_FILENAME_BAD_RE = re.compile(r'[^\w\s-]')
+
+# Template ID patterns, tried in order
+_TEMPLATE_ID_PATTERNS = (
+    re.compile(r'AmbientMixer\.setup\((\d+)\)'),
+    re.compile(r'/vote/(\d+)'),
+    re.compile(r'id_template[=:][\s"\']*(\d+)'),
+)
+
+# Extracted template IDs keyed by a digest of the page HTML
+_TEMPLATE_ID_CACHE: dict[bytes, Optional[str]] = {}
+_TEMPLATE_ID_CACHE_SIZE = 256
+
 
 @dataclass
 class AudioChannel:
@@ -778,104 +799,137 @@ class AmbientMixerPlugin(BasePlugin):
     # =========================================================================
 
     def _extract_template_id(self, html: str) -> Optional[str]:
-        """Extract template ID from ambient-mixer page HTML."""
-        # Try AmbientMixer.setup() pattern first
-        match = re.search(r'AmbientMixer\.setup\((\d+)\)', html)
-        if match:
-            return match.group(1)
-
-        # Try vote link pattern
-        match = re.search(r'/vote/(\d+)', html)
-        if match:
-            return match.group(1)
-
-        # Try id_template parameter
-        match = re.search(r'id_template[=:][\s"\']*(\d+)', html)
-        if match:
-            return match.group(1)
+        """
+        Extract template ID from ambient-mixer page HTML.
 
-        return None
+        Results are cached by content digest so retried imports of the
+        same page skip the regex scans.
+        """
+        key = hashlib.blake2b(html.encode('utf-8', 'ignore'), digest_size=8).digest()
+        if key in _TEMPLATE_ID_CACHE:
+            return _TEMPLATE_ID_CACHE[key]
+
+        # Try AmbientMixer.setup(), then vote link, then id_template parameter
+        template_id = None
+        for pattern in _TEMPLATE_ID_PATTERNS:
+            match = pattern.search(html)
+            if match:
+                template_id = match.group(1)
+                break
+
+        if len(_TEMPLATE_ID_CACHE) >= _TEMPLATE_ID_CACHE_SIZE:
+            # Evict the oldest entry (dicts preserve insertion order)
+            del _TEMPLATE_ID_CACHE[next(iter(_TEMPLATE_ID_CACHE))]
+        _TEMPLATE_ID_CACHE[key] = template_id
+        return template_id
 
     def _parse_template_xml(self, xml_content: str, source_url: str, template_id: str) -> Optional[AmbientMix]:
-        """Parse XML content into an AmbientMix object."""
-        try:
-            root = ET.fromstring(xml_content)
-        except ET.ParseError as e:
-            logger.error(f"Failed to parse XML: {e}")
-            return None
+        """
+        Parse XML content into an AmbientMix object.
 
+        Streams the document with iterparse and clears each top-level
+        element once handled, so only one channel subtree is live at a time.
+        """
         mix = AmbientMix(
             template_id=template_id,
             source_url=source_url,
             harvested_at=datetime.now().isoformat(),
         )
 
+        title = None
+        depth = 0
+        try:
+            for event, elem in ET.iterparse(io.StringIO(xml_content), events=('start', 'end')):
+                if event == 'start':
+                    depth += 1
+                    continue
+
+                depth -= 1
+                if depth != 1:
+                    continue
+
+                # Direct child of the root element
+                tag = elem.tag
+                if tag == 'title':
+                    title = elem.text
+                elif tag == 'category':
+                    mix.category = elem.text or ''
+                elif tag.startswith('channel') and tag[7:].isdigit():
+                    # Ambient-mixer has up to 8 channels
+                    channel_num = int(tag[7:])
+                    if 1 <= channel_num <= 8:
+                        channel = self._parse_channel(elem, channel_num)
+                        if channel:
+                            mix.channels.append(channel)
+                            logger.debug(f"  Channel {channel_num}: {channel.name} ({channel.audio_id})")
+                elem.clear()
+        except ET.ParseError as e:
+            logger.error(f"Failed to parse XML: {e}")
+            return None
+
+        mix.channels.sort(key=lambda ch: ch.channel_num)
+
         # Extract mix name from title element or URL
-        title_elem = root.find('title')
-        if title_elem is not None and title_elem.text:
-            mix.name = title_elem.text.strip()
+        if title:
+            mix.name = title.strip()
         else:
             # Fall back to URL parsing
             from urllib.parse import urlparse
             parsed = urlparse(source_url)
             mix.name = parsed.path.strip('/').split('/')[-1].replace('-', ' ').title()
 
-        mix.category = root.findtext('category', '')
-
-        # Parse channels (ambient-mixer has up to 8 channels)
-        for i in range(1, 9):
-            channel_elem = root.find(f'channel{i}')
-            if channel_elem is None:
-                continue
+        return mix
 
-            url_elem = channel_elem.find('url_audio')
-            if url_elem is None or not url_elem.text or not url_elem.text.strip():
-                continue
+    def _parse_channel(self, channel_elem: ET.Element, i: int) -> Optional[AudioChannel]:
+        """Parse a single <channelN> element into an AudioChannel."""
+        url_elem = channel_elem.find('url_audio')
+        if url_elem is None or not url_elem.text or not url_elem.text.strip():
+            return None
 
-            def get_text(elem_name: str, default: str = "") -> str:
-                elem = channel_elem.find(elem_name)
-                return elem.text.strip() if elem is not None and elem.text else default
-
-            def get_int(elem_name: str, default: int = 0) -> int:
-                try:
-                    return int(get_text(elem_name, str(default)))
-                except ValueError:
-                    return default
-
-            def get_bool(elem_name: str, default: bool = False) -> bool:
-                val = get_text(elem_name, "").lower()
-                return val in ("true", "1", "yes")
-
-            channel = AudioChannel(
-                channel_num=i,
-                name=get_text('name_audio', f'channel_{i}'),
-                audio_id=get_text('id_audio'),
-                url=get_text('url_audio'),
-                volume=get_int('volume', 100),
-                balance=get_int('balance', 0),
-                is_random=get_bool('random'),
-                random_counter=get_int('random_counter', 1),
-                random_unit=get_text('random_unit', '1h'),
-                crossfade=get_bool('crossfade'),
-                mute=get_bool('mute'),
-            )
-
-            mix.channels.append(channel)
-            logger.debug(f"  Channel {i}: {channel.name} ({channel.audio_id})")
+        def get_text(elem_name: str, default: str = "") -> str:
+            elem = channel_elem.find(elem_name)
+            return elem.text.strip() if elem is not None and elem.text else default
 
-        return mix
+        def get_int(elem_name: str, default: int = 0) -> int:
+            try:
+                return int(get_text(elem_name, str(default)))
+            except ValueError:
+                return default
+
+        def get_bool(elem_name: str, default: bool = False) -> bool:
+            val = get_text(elem_name, "").lower()
+            return val in ("true", "1", "yes")
+
+        return AudioChannel(
+            channel_num=i,
+            name=get_text('name_audio', f'channel_{i}'),
+            audio_id=get_text('id_audio'),
+            url=get_text('url_audio'),
+            volume=get_int('volume', 100),
+            balance=get_int('balance', 0),
+            is_random=get_bool('random'),
+            random_counter=get_int('random_counter', 1),
+            random_unit=get_text('random_unit', '1h'),
+            crossfade=get_bool('crossfade'),
+            mute=get_bool('mute'),
+        )
 
     def _sanitize_folder_name(self, name: str) -> str:
         """Create a safe folder name from a string."""
-        safe = re.sub(r'[<>:"/\\|?*]', '', name)
+        safe = name.translate(_FOLDER_BAD_CHARS)
         safe = safe.strip('. ')
-        safe = re.sub(r'\s+', ' ', safe)
+        # Only runs of spaces or other whitespace need the regex collapse
+        if '  ' in safe or not safe.isprintable():
+            safe = _WHITESPACE_RE.sub(' ', safe)
         safe = safe.replace(' ', '_')
         return safe or "Imported_Theme"
 
     def _sanitize_filename(self, name: str) -> str:
         """Create a safe filename component from a string."""
-        safe = re.sub(r'[^\w\s-]', '', name).strip()
+        if name.isascii():
+            safe = name.translate(_FILENAME_ASCII_DROP).strip()
+        else:
+            safe = _FILENAME_BAD_RE.sub('', name).strip()
         safe = safe.replace(' ', '_')
         return safe[:50] or "audio"
 
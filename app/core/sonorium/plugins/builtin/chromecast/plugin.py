@@ -12,6 +12,7 @@ The plugin uses mDNS/Zeroconf for discovery and the Cast protocol for control.
 from __future__ import annotations
 
 import asyncio
+import time
 from pathlib import Path
 from typing import Optional
 
@@ -27,6 +28,12 @@ except ImportError:
     PYCHROMECAST_AVAILABLE = False
     pychromecast = None
 
+# Skip cast.wait() if the device confirmed ready within this window
+CAST_READY_TTL = 30.0
+
+# Coalesce repeated get_speaker_state() polls within this window
+STATE_CACHE_TTL = 1.0
+
 
 class ChromecastPlugin(SpeakerPlugin):
     """
@@ -49,6 +56,23 @@ class ChromecastPlugin(SpeakerPlugin):
     author = "Sonorium"
     builtin = True
 
+    _CAPABILITIES = ("volume", "mute", "pause", "resume")
+
+    _SETTINGS_SCHEMA = {
+        "discovery_timeout": {
+            "type": "number",
+            "default": 5,
+            "label": "Discovery Timeout (seconds)",
+            "min": 1,
+            "max": 30
+        },
+        "auto_reconnect": {
+            "type": "boolean",
+            "default": True,
+            "label": "Auto-reconnect on disconnect"
+        }
+    }
+
     def __init__(self, plugin_dir: Path, settings: dict, audio_path: Optional[Path] = None):
         super().__init__(plugin_dir, settings, audio_path)
 
@@ -59,6 +83,12 @@ class ChromecastPlugin(SpeakerPlugin):
         # Active cast connections
         self._casts: dict[str, 'pychromecast.Chromecast'] = {}
 
+        # Monotonic time of last successful cast.wait() per device UUID
+        self._cast_ready: dict[str, float] = {}
+
+        # Recent device states: speaker_id -> (monotonic time, state)
+        self._state_cache: dict[str, tuple[float, Optional[SpeakerState]]] = {}
+
         # Discovery lock
         self._discovery_lock = asyncio.Lock()
 
@@ -99,6 +129,8 @@ class ChromecastPlugin(SpeakerPlugin):
             except Exception:
                 pass
         self._casts.clear()
+        self._cast_ready.clear()
+        self._state_cache.clear()
 
     async def discover_speakers(self) -> list[NetworkSpeaker]:
         """Discover Chromecast devices on the network."""
@@ -108,12 +140,7 @@ class ChromecastPlugin(SpeakerPlugin):
         async with self._discovery_lock:
             try:
                 # Run discovery in thread pool (blocking operation)
-                loop = asyncio.get_event_loop()
-                speakers = await loop.run_in_executor(
-                    None,
-                    self._discover_sync
-                )
-                return speakers
+                return await asyncio.to_thread(self._discover_sync)
             except Exception as e:
                 logger.error(f"{self.name}: Discovery error: {e}")
                 return []
@@ -175,9 +202,19 @@ class ChromecastPlugin(SpeakerPlugin):
 
     async def play_url(self, speaker_id: str, url: str) -> bool:
         """Play a URL on a Chromecast device."""
+        return await self._play_url(speaker_id, url, wait_active=False)
+
+    async def play_url_and_wait(self, speaker_id: str, url: str) -> bool:
+        """Play a URL and wait until the device reports the media active."""
+        return await self._play_url(speaker_id, url, wait_active=True)
+
+    async def _play_url(self, speaker_id: str, url: str, wait_active: bool) -> bool:
+        """Resolve the cast and start playback in the thread pool."""
         if not PYCHROMECAST_AVAILABLE:
             return False
 
+        self._state_cache.pop(speaker_id, None)
+
         cast = await self._get_cast(speaker_id)
         if not cast:
             logger.error(f"{self.name}: Speaker {speaker_id} not found")
@@ -185,23 +222,31 @@ class ChromecastPlugin(SpeakerPlugin):
 
         try:
             # Run in thread pool (blocking operation)
-            loop = asyncio.get_event_loop()
-            success = await loop.run_in_executor(
-                None,
-                self._play_sync,
-                cast,
-                url
-            )
-            return success
+            return await asyncio.to_thread(self._play_sync, cast, url, wait_active)
         except Exception as e:
             logger.error(f"{self.name}: Play failed: {e}")
             return False
 
-    def _play_sync(self, cast: 'pychromecast.Chromecast', url: str) -> bool:
-        """Synchronous play (runs in thread pool)."""
+    def _play_sync(
+        self,
+        cast: 'pychromecast.Chromecast',
+        url: str,
+        wait_active: bool = False
+    ) -> bool:
+        """
+        Synchronous play (runs in thread pool).
+
+        LIVE streams don't need confirmation that the media became active,
+        so by default this returns as soon as the play command is sent.
+        """
         try:
-            # Wait for connection
-            cast.wait(timeout=10)
+            # Wait for connection unless the socket already confirms it
+            uuid = str(cast.uuid)
+            connected = cast.socket_client and cast.socket_client.is_connected
+            recently_ready = time.monotonic() - self._cast_ready.get(uuid, 0.0) < CAST_READY_TTL
+            if not (connected or recently_ready):
+                cast.wait(timeout=10)
+                self._cast_ready[uuid] = time.monotonic()
 
             # Get media controller
             mc = cast.media_controller
@@ -215,7 +260,8 @@ class ChromecastPlugin(SpeakerPlugin):
                 stream_type="LIVE"  # Continuous stream
             )
 
-            mc.block_until_active(timeout=10)
+            if wait_active:
+                mc.block_until_active(timeout=10)
             return True
 
         except Exception as e:
@@ -227,13 +273,14 @@ class ChromecastPlugin(SpeakerPlugin):
         if not PYCHROMECAST_AVAILABLE:
             return False
 
+        self._state_cache.pop(speaker_id, None)
+
         cast = await self._get_cast(speaker_id)
         if not cast:
             return False
 
         try:
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(None, self._stop_sync, cast)
+            await asyncio.to_thread(self._stop_sync, cast)
             return True
         except Exception as e:
             logger.error(f"{self.name}: Stop failed: {e}")
@@ -251,16 +298,14 @@ class ChromecastPlugin(SpeakerPlugin):
         if not PYCHROMECAST_AVAILABLE:
             return False
 
+        self._state_cache.pop(speaker_id, None)
+
         cast = await self._get_cast(speaker_id)
         if not cast:
             return False
 
         try:
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(
-                None,
-                lambda: cast.media_controller.pause()
-            )
+            await asyncio.to_thread(cast.media_controller.pause)
             return True
         except Exception as e:
             logger.error(f"{self.name}: Pause failed: {e}")
@@ -271,16 +316,14 @@ class ChromecastPlugin(SpeakerPlugin):
         if not PYCHROMECAST_AVAILABLE:
             return False
 
+        self._state_cache.pop(speaker_id, None)
+
         cast = await self._get_cast(speaker_id)
         if not cast:
             return False
 
         try:
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(
-                None,
-                lambda: cast.media_controller.play()
-            )
+            await asyncio.to_thread(cast.media_controller.play)
             return True
         except Exception as e:
             logger.error(f"{self.name}: Resume failed: {e}")
@@ -296,11 +339,7 @@ class ChromecastPlugin(SpeakerPlugin):
             return False
 
         try:
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(
-                None,
-                lambda: cast.set_volume(max(0.0, min(1.0, level)))
-            )
+            await asyncio.to_thread(cast.set_volume, max(0.0, min(1.0, level)))
 
             # Update cached speaker
             speaker = self.get_speaker(speaker_id)
@@ -323,11 +362,7 @@ class ChromecastPlugin(SpeakerPlugin):
             return False
 
         try:
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(
-                None,
-                lambda: cast.set_volume_muted(muted)
-            )
+            await asyncio.to_thread(cast.set_volume_muted, muted)
 
             speaker = self.get_speaker(speaker_id)
             if speaker:
@@ -339,11 +374,55 @@ class ChromecastPlugin(SpeakerPlugin):
             logger.error(f"{self.name}: Mute failed: {e}")
             return False
 
+    # --- Bulk commands ---
+
+    async def set_volume_bulk(self, updates: dict[str, float]) -> dict[str, bool]:
+        """
+        Set volume on several speakers concurrently.
+
+        Args:
+            updates: Dict mapping speaker_id to volume level 0.0-1.0
+
+        Returns:
+            Dict mapping speaker_id to success status
+        """
+        speaker_ids = list(updates)
+        return await self._gather_results(
+            speaker_ids,
+            (self.set_volume(sid, level) for sid, level in updates.items())
+        )
+
+    async def pause_all(self, ids: Optional[list[str]] = None) -> dict[str, bool]:
+        """
+        Pause playback on several speakers concurrently.
+
+        Args:
+            ids: Speaker IDs to pause (default: all known speakers)
+
+        Returns:
+            Dict mapping speaker_id to success status
+        """
+        speaker_ids = list(self._speakers) if ids is None else list(ids)
+        return await self._gather_results(
+            speaker_ids,
+            (self.pause(sid) for sid in speaker_ids)
+        )
+
     async def get_speaker_state(self, speaker_id: str) -> Optional[SpeakerState]:
         """Get current speaker state from device."""
         if not PYCHROMECAST_AVAILABLE:
             return None
 
+        ts, state = self._state_cache.get(speaker_id, (0.0, None))
+        if time.monotonic() - ts < STATE_CACHE_TTL:
+            return state
+
+        state = await self._fetch_speaker_state(speaker_id)
+        self._state_cache[speaker_id] = (time.monotonic(), state)
+        return state
+
+    async def _fetch_speaker_state(self, speaker_id: str) -> SpeakerState:
+        """Read the current media state from the device."""
         cast = await self._get_cast(speaker_id)
         if not cast:
             return SpeakerState.OFFLINE
@@ -363,21 +442,8 @@ class ChromecastPlugin(SpeakerPlugin):
 
     def get_capabilities(self) -> list[str]:
         """Chromecast supports volume, mute, pause, resume."""
-        return ["volume", "mute", "pause", "resume"]
+        return list(self._CAPABILITIES)
 
     def get_settings_schema(self) -> dict:
         """Plugin settings."""
-        return {
-            "discovery_timeout": {
-                "type": "number",
-                "default": 5,
-                "label": "Discovery Timeout (seconds)",
-                "min": 1,
-                "max": 30
-            },
-            "auto_reconnect": {
-                "type": "boolean",
-                "default": True,
-                "label": "Auto-reconnect on disconnect"
-            }
-        }
+        return self._SETTINGS_SCHEMA
@@ -14,7 +14,10 @@ from __future__ import annotations
 import asyncio
 import hashlib
 import json
+import os
 import re
+import time
+import uuid
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
@@ -24,10 +27,93 @@ from urllib.parse import urlparse, urljoin
 from sonorium.plugins.base import BasePlugin
 from sonorium.obs import logger
 
+# httpx is required for imports; checked when an import is requested
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+# orjson is optional; it serializes straight to UTF-8 bytes
+try:
+    import orjson
+
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, indent=2).encode('utf-8')
+
+# HTTP/2 support for httpx is optional (pip install httpx[http2])
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
 
 # Constants
 USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
 SUPPORTED_EXTENSIONS = ['.ogg', '.wav', '.mp3']
+HEAD_END_TAG = b"</head>"
+PAGE_HEAD_LIMIT = 128 * 1024  # Stop reading the page after this many bytes
+DOWNLOAD_RATE_LIMIT = 4  # Max download requests started per second
+
+# Precompiled patterns
+# PHP source file: <script src="...php"> (group 1) or any src="...Sounds...php" (group 2)
+_PHP_SRC_RE = re.compile(
+    r'<script[^>]+src=["\']([^"\']+\.php)["\']'
+    r'|src=["\']([^"\']+Sounds[^"\']*\.php)["\']',
+    re.IGNORECASE,
+)
+# fileExt = ".ogg" or fileExt:".ogg", any supported extension
+_EXT_RE = re.compile(
+    r'fileExt\s*[=:]\s*["\']?(\.(?:ogg|wav|mp3))',
+    re.IGNORECASE,
+)
+# sourceFileA[0] = 'url', sourceFile = "url", etc.
+# Quoted and bare values are separate alternatives so there is no optional
+# closing quote for the engine to backtrack over.
+_SOURCE_RE = re.compile(
+    r'sourceFile[A-Za-z]?(?:\[\d+\])?\s*[=:]\s*'
+    r'(?:"([^"]*)"|\'([^\']*)\'|(https?://[^\s;+,)]+))',
+    re.IGNORECASE,
+)
+_TRAIL_EXT_RE = re.compile(r'\.(ogg|wav|mp3)$', re.IGNORECASE)
+_WS_RE = re.compile(r'\s+')
+
+# Characters not allowed in folder names, removed via str.translate
+_FOLDER_BAD_CHARS = str.maketrans('', '', '<>:"/\\|?*')
+
+
+class _RateLimiter:
+    """
+    Token bucket allowing `rate` acquisitions per `period` seconds.
+
+    Bursts of up to `rate` go through immediately; beyond that callers
+    wait for tokens to refill instead of sleeping a fixed delay each.
+    """
+
+    def __init__(self, rate: float, period: float = 1.0):
+        self._capacity = rate
+        self._tokens = rate
+        self._fill_rate = rate / period
+        self._last = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self._capacity,
+                    self._tokens + (now - self._last) * self._fill_rate
+                )
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self._fill_rate)
 
 
 @dataclass
@@ -75,6 +161,7 @@ class MyNoiseSoundscape:
                     "name": s.name,
                     "url": s.full_url,
                     "local_filename": s.local_filename,
+                    "hash": s.file_hash,
                 }
                 for s in self.sources
             ],
@@ -140,6 +227,13 @@ class MyNoisePlugin(BasePlugin):
                 "default": "ogg",
                 "label": "Preferred audio format",
             },
+            "max_concurrent_downloads": {
+                "type": "number",
+                "default": 6,
+                "label": "Max concurrent downloads",
+                "min": 1,
+                "max": 16,
+            },
         }
 
     async def handle_action(self, action: str, data: dict) -> dict:
@@ -172,29 +266,39 @@ class MyNoisePlugin(BasePlugin):
                 "message": "URL must be from mynoise.net",
             }
 
-        try:
-            # Import httpx for async HTTP requests
-            try:
-                import httpx
-            except ImportError:
-                return {
-                    "success": False,
-                    "message": "httpx library not available. Please install it.",
-                }
+        if httpx is None:
+            return {
+                "success": False,
+                "message": "httpx library not available. Please install it.",
+            }
 
+        try:
+            # One pooled client for page, PHP source and all downloads so
+            # concurrent downloads share keep-alive (or HTTP/2) connections
             async with httpx.AsyncClient(
+                http2=HTTP2_AVAILABLE,
                 follow_redirects=True,
                 timeout=30.0,
-                headers={"User-Agent": USER_AGENT}
+                headers={"User-Agent": USER_AGENT},
+                limits=httpx.Limits(
+                    max_connections=16,
+                    max_keepalive_connections=16,
+                    keepalive_expiry=30.0,
+                ),
             ) as client:
-                # Step 1: Fetch the page to find the PHP source
+                # Step 1: Fetch the page head to find the PHP source
                 logger.info(f"Fetching MyNoise page: {url}")
-                response = await client.get(url)
-                response.raise_for_status()
-                html = response.text
+                html, complete = await self._fetch_page_head(client, url)
 
                 # Find the PHP source file (usually referenced in script tag)
                 php_url = self._find_php_source(html, url)
+                if not php_url and not complete:
+                    # Not in the head; fetch the whole page
+                    response = await client.get(url)
+                    response.raise_for_status()
+                    html = response.text
+                    php_url = self._find_php_source(html, url)
+
                 if not php_url:
                     # Try parsing audio directly from the HTML/JS
                     logger.info("No PHP source found, trying direct HTML parsing")
@@ -256,13 +360,37 @@ class MyNoisePlugin(BasePlugin):
 
                 logger.info(f"Downloading to: {theme_folder}")
 
-                # Step 5: Download audio files
+                # Step 5: Download audio files concurrently
+                with os.scandir(theme_folder) as it:
+                    existing = {entry.name for entry in it}
+
+                sem = asyncio.Semaphore(int(self.get_setting("max_concurrent_downloads", 6)))
+
+                # Cap the request rate to stay polite to the server
+                limiter = _RateLimiter(DOWNLOAD_RATE_LIMIT)
+
+                async def _guarded(src: AudioSource) -> bool:
+                    async with sem:
+                        await limiter.acquire()
+                        return await self._download_audio(client, src, theme_folder, existing)
+
+                # Eager tasks run up to their first real suspension (usually
+                # the semaphore fast path) without a trip through the scheduler
+                loop = asyncio.get_running_loop()
+                if hasattr(asyncio, "eager_task_factory"):  # Python 3.12+
+                    tasks = [asyncio.eager_task_factory(loop, _guarded(source))
+                             for source in soundscape.sources]
+                else:
+                    tasks = [loop.create_task(_guarded(source))
+                             for source in soundscape.sources]
+
+                results = await asyncio.gather(*tasks, return_exceptions=True)
+
                 downloaded = 0
                 track_metadata = {}
 
-                for source in soundscape.sources:
-                    success = await self._download_audio(client, source, theme_folder)
-                    if success:
+                for source, success in zip(soundscape.sources, results):
+                    if success is True:
                         downloaded += 1
                         if source.local_filename:
                             track_metadata[source.local_filename] = {
@@ -272,15 +400,15 @@ class MyNoisePlugin(BasePlugin):
                                 },
                             }
 
-                    # Small delay between downloads
-                    await asyncio.sleep(0.3)
-
                 if downloaded == 0:
                     return {
                         "success": False,
                         "message": "Failed to download any audio files.",
                     }
 
+                # Steps 6-8 build small payloads, then write them concurrently
+                writes = []
+
                 # Step 6: Create metadata.json
                 if self.get_setting("auto_create_metadata", True):
                     metadata = {
@@ -298,16 +426,22 @@ class MyNoisePlugin(BasePlugin):
                         "tracks": track_metadata,
                     }
 
-                    metadata_path = theme_folder / "metadata.json"
-                    metadata_path.write_text(json.dumps(metadata, indent=2))
-                    logger.info(f"Created metadata.json for {theme_name}")
+                    writes.append((theme_folder / "metadata.json", _dumps(metadata)))
 
                 # Step 7: Write MANIFEST.json
-                manifest_path = theme_folder / "MANIFEST.json"
-                manifest_path.write_text(json.dumps(soundscape.to_manifest(), indent=2))
+                writes.append((theme_folder / "MANIFEST.json", _dumps(soundscape.to_manifest())))
 
                 # Step 8: Write ATTRIBUTION.md
-                self._write_attribution(soundscape, theme_folder / "ATTRIBUTION.md")
+                attribution = self._build_attribution(soundscape)
+                writes.append((theme_folder / "ATTRIBUTION.md", attribution.encode('utf-8')))
+
+                # Off the event loop, so other plugin work isn't blocked on disk
+                await asyncio.gather(*(
+                    asyncio.to_thread(path.write_bytes, payload)
+                    for path, payload in writes
+                ))
+                if self.get_setting("auto_create_metadata", True):
+                    logger.info(f"Created metadata.json for {theme_name}")
 
                 return {
                     "success": True,
@@ -327,87 +461,143 @@ class MyNoisePlugin(BasePlugin):
                 "message": f"Import failed: {e}",
             }
 
+    async def _fetch_page_head(self, client, url: str) -> tuple[str, bool]:
+        """
+        Fetch a page only as far as its </head>.
+
+        The PHP source script is referenced in the head, so the rest of the
+        body (inline CSS/JS) doesn't need to be downloaded.
+
+        Returns:
+            Tuple of (html, complete) where complete is False if reading
+            stopped before the end of the response
+        """
+        buf = bytearray()
+        complete = True
+        async with client.stream("GET", url) as response:
+            response.raise_for_status()
+            async for chunk in response.aiter_bytes(16384):
+                # Only rescan the new bytes (plus overlap for a split tag)
+                start = max(0, len(buf) - len(HEAD_END_TAG))
+                buf.extend(chunk)
+                if HEAD_END_TAG in bytes(buf[start:]).lower() or len(buf) > PAGE_HEAD_LIMIT:
+                    complete = False
+                    break
+            encoding = response.encoding or "utf-8"
+
+        return buf.decode(encoding, errors="replace"), complete
+
     def _find_php_source(self, html: str, base_url: str) -> Optional[str]:
         """Find the PHP source file URL from the HTML."""
-        # Look for script src with .php
-        patterns = [
-            r'<script[^>]+src=["\']([^"\']+\.php)["\']',
-            r'src=["\']([^"\']+Sounds[^"\']*\.php)["\']',
-        ]
-
-        for pattern in patterns:
-            match = re.search(pattern, html, re.IGNORECASE)
-            if match:
+        # Single pass; a <script src> match wins over a bare Sounds src
+        php_path = None
+        for match in _PHP_SRC_RE.finditer(html):
+            if match.group(1):
                 php_path = match.group(1)
-                # Make absolute URL
-                if not php_path.startswith('http'):
-                    php_path = urljoin(base_url, php_path)
-                return php_path
+                break
+            if php_path is None:
+                php_path = match.group(2)
 
-        return None
+        if not php_path:
+            return None
+
+        # Make absolute URL
+        if not php_path.startswith('http'):
+            php_path = urljoin(base_url, php_path)
+        return php_path
 
     def _find_extensions(self, content: str) -> list:
         """Find all supported file extensions in the content."""
-        found = []
-        for ext in SUPPORTED_EXTENSIONS:
-            # Look for patterns like fileExt = ".ogg" or fileExt:".ogg"
-            pattern = rf'fileExt\s*[=:]\s*["\']?{re.escape(ext)}["\']?'
-            if re.search(pattern, content, re.IGNORECASE):
-                found.append(ext)
+        # Single pass over the content for all extensions
+        seen = set()
+        for match in _EXT_RE.finditer(content):
+            ext = match.group(1).lower()
+            if ext not in seen:
+                seen.add(ext)
                 logger.debug(f"Found extension: {ext}")
+                if len(seen) == len(SUPPORTED_EXTENSIONS):
+                    break
 
-        return found
+        # Preserve SUPPORTED_EXTENSIONS ordering
+        return [ext for ext in SUPPORTED_EXTENSIONS if ext in seen]
 
     def _find_source_files(self, content: str) -> list:
         """Find all sourceFile references and extract URLs."""
         source_urls = []
+        seen = set()  # Membership checks; the list keeps discovery order
 
-        # Pattern to match sourceFile variations with URLs
-        # Matches: sourceFileA[0] = 'url', sourceFile = "url", etc.
-        pattern = r'sourceFile[A-Za-z]?(?:\[\d+\])?\s*[=:]\s*["\']?(https?://[^"\'\s;+]+)["\']?'
+        # Match sourceFile variations with URLs
+        matches = _SOURCE_RE.findall(content)
 
-        matches = re.findall(pattern, content, re.IGNORECASE)
+        for groups in matches:
+            url = groups[0] or groups[1] or groups[2]
+            if not url.lower().startswith(('http://', 'https://')):
+                continue
 
-        for url in matches:
             # Remove any trailing file extension
-            clean_url = re.sub(r'\.(ogg|wav|mp3)$', '', url, flags=re.IGNORECASE)
+            clean_url = _TRAIL_EXT_RE.sub('', url)
             clean_url = clean_url.rstrip('/')
 
-            if clean_url and clean_url not in source_urls:
+            if clean_url and clean_url not in seen:
+                seen.add(clean_url)
                 source_urls.append(clean_url)
                 logger.debug(f"Found source: {clean_url}")
 
         return source_urls
 
-    async def _download_audio(self, client, source: AudioSource, dest_dir: Path) -> bool:
-        """Download a single audio file."""
+    async def _download_audio(
+        self,
+        client,
+        source: AudioSource,
+        dest_dir: Path,
+        existing: Optional[set[str]] = None,
+    ) -> bool:
+        """
+        Download a single audio file.
+
+        Args:
+            client: httpx client
+            source: Audio source to download
+            dest_dir: Theme folder to download into
+            existing: File names already in dest_dir (from one scandir),
+                used to skip downloads without a stat per file
+        """
         if not source.full_url:
             return False
 
         # Generate filename
         url_path = urlparse(source.full_url).path
-        filename = Path(url_path).name
+        filename = url_path.rsplit('/', 1)[-1]
         if not filename or filename == source.extension:
             filename = f"{source.name}{source.extension}"
 
-        dest_path = dest_dir / filename
+        dest_path = os.path.join(dest_dir, filename)
 
-        # Skip if already exists
-        if dest_path.exists():
+        # Skip if already exists (lexists covers files created since the scan)
+        if (existing is not None and filename in existing) or os.path.lexists(dest_path):
             logger.info(f"  Skipping (exists): {filename}")
             source.local_filename = filename
             return True
 
         logger.info(f"  Downloading: {source.name} -> {filename}")
 
-        try:
-            response = await client.get(source.full_url, timeout=60.0)
-            response.raise_for_status()
+        # Download to a unique temp file and move it into place when complete, so
+        # a failed or cancelled download never looks like a finished track and
+        # sources sharing a filename don't write the same file concurrently
+        part_path = f"{dest_path}.{uuid.uuid4().hex[:8]}.part"
 
-            dest_path.write_bytes(response.content)
+        try:
+            # Stream to disk, hashing chunks as they arrive
+            hasher = hashlib.md5()
+            async with client.stream("GET", source.full_url, timeout=60.0) as response:
+                response.raise_for_status()
+                with open(part_path, "wb") as f:
+                    async for chunk in response.aiter_bytes(chunk_size=65536):
+                        f.write(chunk)
+                        hasher.update(chunk)
+            os.replace(part_path, dest_path)
 
-            # Calculate hash
-            source.file_hash = hashlib.md5(response.content).hexdigest()
+            source.file_hash = hasher.hexdigest()
             source.local_filename = filename
 
             return True
@@ -416,16 +606,24 @@ class MyNoisePlugin(BasePlugin):
             logger.warning(f"  Failed to download {source.name}: {e}")
             return False
 
+        finally:
+            try:
+                os.remove(part_path)
+            except FileNotFoundError:
+                pass
+
     def _sanitize_folder_name(self, name: str) -> str:
         """Create a safe folder name from a string."""
-        safe = re.sub(r'[<>:"/\\|?*]', '', name)
+        safe = name.translate(_FOLDER_BAD_CHARS)
         safe = safe.strip('. ')
-        safe = re.sub(r'\s+', ' ', safe)
+        # Only runs of spaces or other whitespace need the regex collapse
+        if '  ' in safe or not safe.isprintable():
+            safe = _WS_RE.sub(' ', safe)
         safe = safe.replace(' ', '_')
         return safe or "Imported_Theme"
 
-    def _write_attribution(self, soundscape: MyNoiseSoundscape, filepath: Path):
-        """Write human-readable attribution file."""
+    def _build_attribution(self, soundscape: MyNoiseSoundscape) -> str:
+        """Build the human-readable ATTRIBUTION.md contents."""
         lines = [
             f"# Attribution for {soundscape.name}",
             "",
@@ -458,4 +656,4 @@ class MyNoisePlugin(BasePlugin):
             "*Generated by Sonorium MyNoise Plugin*",
         ])
 
-        filepath.write_text('\n'.join(lines))
+        return '\n'.join(lines)
@@ -6,8 +6,10 @@ Handles discovery and dynamic loading of plugins from the plugins directory.
 
 from __future__ import annotations
 
+import functools
 import importlib.util
 import json
+import os
 import shutil
 import sys
 from pathlib import Path
@@ -17,10 +19,20 @@ from sonorium.plugins.base import BasePlugin
 from sonorium.obs import logger
 
 
+# Parsed manifests and loaded plugin classes, keyed by plugin directory.
+# Entries carry the source file's mtime so edits on disk are picked up.
+_MANIFEST_CACHE: dict[Path, tuple[int, dict]] = {}
+_CLASS_CACHE: dict[Path, tuple[tuple[int, str, Optional[str]], Type[BasePlugin]]] = {}
+
+
+@functools.lru_cache(maxsize=1)
 def get_plugins_dir() -> Path:
-    """Get the plugins directory (next to the EXE in a 'plugins' folder)."""
-    import sys
+    """
+    Get the plugins directory (next to the EXE in a 'plugins' folder).
 
+    The directory is created on first call and the result is cached; call
+    get_plugins_dir.cache_clear() if it may have been removed at runtime.
+    """
     if getattr(sys, 'frozen', False):
         # Running as compiled EXE - plugins folder next to EXE
         plugins_dir = Path(sys.executable).parent / 'plugins'
@@ -52,14 +64,19 @@ def discover_plugins(plugins_dir: Optional[Path] = None) -> list[Path]:
         return []
 
     plugin_dirs = []
-    for item in plugins_dir.iterdir():
-        if item.is_dir():
-            plugin_file = item / "plugin.py"
-            if plugin_file.exists():
-                plugin_dirs.append(item)
-                logger.debug(f"Found plugin directory: {item.name}")
+    # scandir entries carry their type from the directory read, saving a stat each
+    with os.scandir(plugins_dir) as it:
+        for entry in it:
+            # Hidden entries (.git) and dunder dirs (__pycache__) are never plugins
+            if entry.name.startswith(('.', '__')):
+                continue
+            if not entry.is_dir():
+                continue
+            if os.path.isfile(os.path.join(entry.path, "plugin.py")):
+                plugin_dirs.append(Path(entry.path))
+                logger.debug(f"Found plugin directory: {entry.name}")
             else:
-                logger.debug(f"Skipping {item.name}: no plugin.py found")
+                logger.debug(f"Skipping {entry.name}: no plugin.py found")
 
     return plugin_dirs
 
@@ -79,9 +96,21 @@ def load_manifest(plugin_dir: Path) -> dict:
     """
     manifest_path = plugin_dir / "manifest.json"
 
-    if manifest_path.exists():
+    try:
+        mtime = manifest_path.stat().st_mtime_ns
+    except OSError:
+        mtime = None
+
+    if mtime is not None:
+        cached = _MANIFEST_CACHE.get(plugin_dir)
+        if cached and cached[0] == mtime:
+            # Shallow copy: callers fill in auto-detected fields
+            return dict(cached[1])
+
         try:
-            return json.loads(manifest_path.read_text())
+            manifest = json.loads(manifest_path.read_text())
+            _MANIFEST_CACHE[plugin_dir] = (mtime, manifest)
+            return dict(manifest)
         except Exception as e:
             logger.warning(f"Failed to read manifest from {manifest_path}: {e}")
 
@@ -131,10 +160,17 @@ def load_plugin_class(plugin_dir: Path, manifest: dict) -> Optional[Type[BasePlu
     entry_point = manifest.get("entry_point", "plugin.py")
     plugin_file = plugin_dir / entry_point
 
-    if not plugin_file.exists():
+    try:
+        mtime = plugin_file.stat().st_mtime_ns
+    except OSError:
         logger.error(f"Plugin entry point not found: {plugin_file}")
         return None
 
+    cache_key = (mtime, entry_point, manifest.get("plugin_class"))
+    cached = _CLASS_CACHE.get(plugin_dir)
+    if cached and cached[0] == cache_key:
+        return cached[1]
+
     try:
         # Create a unique module name to avoid conflicts
         module_name = f"sonorium_plugin_{plugin_dir.name}"
@@ -156,23 +192,27 @@ def load_plugin_class(plugin_dir: Path, manifest: dict) -> Optional[Type[BasePlu
             # Use explicitly specified class
             plugin_class = getattr(module, plugin_class_name, None)
         else:
-            # Auto-detect: find first class that inherits from BasePlugin
-            plugin_class = None
-            for attr_name in dir(module):
-                attr = getattr(module, attr_name)
-                if (
-                    isinstance(attr, type)
-                    and issubclass(attr, BasePlugin)
-                    and attr is not BasePlugin
-                ):
-                    plugin_class = attr
-                    break
+            # Module-level __plugin__ hint, else auto-detect the first
+            # BasePlugin subclass defined in the module itself (namespace
+            # order puts imported bases such as SpeakerPlugin first)
+            plugin_class = getattr(module, "__plugin__", None)
+            if plugin_class is None:
+                for attr in vars(module).values():
+                    if (
+                        isinstance(attr, type)
+                        and issubclass(attr, BasePlugin)
+                        and attr is not BasePlugin
+                        and attr.__module__ == module_name
+                    ):
+                        plugin_class = attr
+                        break
 
         if plugin_class is None:
             logger.error(f"No BasePlugin subclass found in {plugin_file}")
             return None
 
         logger.debug(f"Loaded plugin class: {plugin_class.__name__} from {plugin_dir.name}")
+        _CLASS_CACHE[plugin_dir] = (cache_key, plugin_class)
         return plugin_class
 
     except Exception as e:
@@ -180,6 +220,21 @@ def load_plugin_class(plugin_dir: Path, manifest: dict) -> Optional[Type[BasePlu
         return None
 
 
+def invalidate(plugin_dir: Optional[Path] = None) -> None:
+    """
+    Drop cached manifests and plugin classes.
+
+    Args:
+        plugin_dir: Plugin directory to invalidate (default: all plugins)
+    """
+    if plugin_dir is None:
+        _MANIFEST_CACHE.clear()
+        _CLASS_CACHE.clear()
+    else:
+        _MANIFEST_CACHE.pop(plugin_dir, None)
+        _CLASS_CACHE.pop(plugin_dir, None)
+
+
 def instantiate_plugin(
     plugin_class: Type[BasePlugin],
     plugin_dir: Path,
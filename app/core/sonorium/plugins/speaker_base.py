@@ -27,7 +27,7 @@ class SpeakerState(str, Enum):
     BUFFERING = "buffering"   # Loading/buffering
 
 
-@dataclass
+@dataclass(slots=True)
 class NetworkSpeaker:
     """
     Represents a discovered network speaker.
@@ -46,21 +46,30 @@ class NetworkSpeaker:
     current_media: Optional[str] = None  # Currently playing URL
     capabilities: list[str] = field(default_factory=list)  # ["audio", "volume", "mute"]
     extra: dict = field(default_factory=dict)  # Plugin-specific data
+    _cached_dict: Optional[dict] = field(default=None, init=False, repr=False, compare=False)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        # Any field assignment invalidates the cached to_dict() result
+        if name != "_cached_dict":
+            object.__setattr__(self, "_cached_dict", None)
+        object.__setattr__(self, name, value)
 
     def to_dict(self) -> dict:
-        """Serialize to dict for API."""
-        return {
-            "id": self.id,
-            "name": self.name,
-            "model": self.model,
-            "manufacturer": self.manufacturer,
-            "ip_address": self.ip_address,
-            "state": self.state.value,
-            "volume": self.volume,
-            "is_muted": self.is_muted,
-            "current_media": self.current_media,
-            "capabilities": self.capabilities,
-        }
+        """Serialize to dict for API. Cached until a field changes, so don't mutate the result."""
+        if self._cached_dict is None:
+            self._cached_dict = {
+                "id": self.id,
+                "name": self.name,
+                "model": self.model,
+                "manufacturer": self.manufacturer,
+                "ip_address": self.ip_address,
+                "state": self.state.value,
+                "volume": self.volume,
+                "is_muted": self.is_muted,
+                "current_media": self.current_media,
+                "capabilities": self.capabilities,
+            }
+        return self._cached_dict
 
 
 class SpeakerPlugin(BasePlugin):
@@ -81,17 +90,28 @@ class SpeakerPlugin(BasePlugin):
     - resume(speaker_id): Resume playback
     - mute(speaker_id, muted): Mute/unmute
     - get_speaker_state(speaker_id): Get current state
+    - probe_speaker(speaker): Cheap reachability check for a known speaker
     """
 
     # Speaker plugin type identifier
     plugin_type: str = "speaker"
 
+    # Discovery runs a full network scan every Nth cycle; the cycles in
+    # between only probe already-known speakers
+    FULL_SCAN_EVERY: int = 5
+    PROBE_TIMEOUT: float = 2.0
+    # Consecutive missed discovery cycles before a speaker is marked offline
+    MISSES_BEFORE_OFFLINE: int = 3
+
     def __init__(self, plugin_dir: Path, settings: dict, audio_path: Optional[Path] = None):
         super().__init__(plugin_dir, settings, audio_path)
 
         # Discovered speakers
         self._speakers: dict[str, NetworkSpeaker] = {}
 
+        # Consecutive missed discovery cycles per speaker
+        self._miss_counts: dict[str, int] = {}
+
         # Discovery state
         self._discovery_running = False
         self._discovery_task: Optional[asyncio.Task] = None
@@ -144,6 +164,10 @@ class SpeakerPlugin(BasePlugin):
 
     def _update_speaker(self, speaker: NetworkSpeaker) -> None:
         """Update a speaker in the cache and notify listeners."""
+        # A freshly discovered copy identical to the cached one is not a change
+        cached = self._speakers.get(speaker.id)
+        if cached is not None and cached is not speaker and cached == speaker:
+            return
         self._speakers[speaker.id] = speaker
         if self._on_speaker_change:
             self._on_speaker_change(speaker)
@@ -152,6 +176,7 @@ class SpeakerPlugin(BasePlugin):
         """Remove a speaker from the cache."""
         if speaker_id in self._speakers:
             del self._speakers[speaker_id]
+        self._miss_counts.pop(speaker_id, None)
 
     # --- Abstract methods (must implement) ---
 
@@ -230,6 +255,31 @@ class SpeakerPlugin(BasePlugin):
         speaker = self.get_speaker(speaker_id)
         return speaker.state if speaker else None
 
+    async def probe_speaker(self, speaker: NetworkSpeaker) -> Optional[bool]:
+        """
+        Check whether a known speaker is still reachable.
+
+        Default: open a TCP connection to its control port.
+
+        Returns:
+            True if reachable, False if not, None if the speaker can't be probed
+        """
+        if not speaker.ip_address or not speaker.port:
+            return None
+        try:
+            _, writer = await asyncio.wait_for(
+                asyncio.open_connection(speaker.ip_address, speaker.port),
+                timeout=self.PROBE_TIMEOUT
+            )
+        except (OSError, asyncio.TimeoutError):
+            return False
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError:
+            pass
+        return True
+
     # --- Discovery control ---
 
     async def start_discovery(self, interval: float = 30.0) -> None:
@@ -262,31 +312,76 @@ class SpeakerPlugin(BasePlugin):
 
     async def _discovery_loop(self, interval: float) -> None:
         """Background discovery loop."""
+        cycle = 0
         while self._discovery_running:
             try:
-                speakers = await self.discover_speakers()
-
-                # Update cache
-                found_ids = set()
-                for speaker in speakers:
-                    found_ids.add(speaker.id)
-                    self._update_speaker(speaker)
-
-                # Mark missing speakers as offline
-                for speaker_id in list(self._speakers.keys()):
-                    if speaker_id not in found_ids:
-                        speaker = self._speakers[speaker_id]
-                        if speaker.state != SpeakerState.OFFLINE:
-                            speaker.state = SpeakerState.OFFLINE
-                            self._update_speaker(speaker)
-
-                logger.debug(f"{self.name}: Found {len(speakers)} speakers")
+                # Known speakers are probed first; the full scan runs periodically,
+                # or whenever probing can't account for every known speaker
+                full_scan = cycle % self.FULL_SCAN_EVERY == 0 or not self._speakers
+                if not full_scan:
+                    full_scan = not await self._fast_refresh()
+                if full_scan:
+                    await self._full_scan()
 
             except Exception as e:
                 logger.error(f"{self.name}: Discovery error: {e}")
 
+            cycle += 1
             await asyncio.sleep(interval)
 
+    async def _full_scan(self) -> None:
+        """Discover speakers on the network and mark missing ones as offline."""
+        speakers = await self.discover_speakers()
+
+        # Update cache
+        found_ids = set()
+        for speaker in speakers:
+            found_ids.add(speaker.id)
+            self._miss_counts.pop(speaker.id, None)
+            self._update_speaker(speaker)
+
+        # Mark missing speakers as offline
+        for speaker_id in list(self._speakers.keys()):
+            if speaker_id not in found_ids:
+                self._mark_missing(self._speakers[speaker_id])
+
+        logger.debug(f"{self.name}: Found {len(speakers)} speakers")
+
+    async def _fast_refresh(self) -> bool:
+        """
+        Probe all known speakers concurrently.
+
+        Returns:
+            False if a full scan is needed (a speaker couldn't be probed,
+            or an offline speaker came back and its state is unknown)
+        """
+        speakers = list(self._speakers.values())
+        results = await asyncio.gather(
+            *(self.probe_speaker(s) for s in speakers),
+            return_exceptions=True
+        )
+
+        complete = True
+        for speaker, result in zip(speakers, results):
+            if result is None or (result is True and speaker.state == SpeakerState.OFFLINE):
+                complete = False
+            elif result is True:
+                self._miss_counts.pop(speaker.id, None)
+            else:
+                self._mark_missing(speaker)
+
+        logger.debug(f"{self.name}: Probed {len(speakers)} known speakers")
+        return complete
+
+    def _mark_missing(self, speaker: NetworkSpeaker) -> None:
+        """Handle a known speaker that didn't respond to discovery."""
+        # Debounced: a single dropped mDNS response doesn't take a speaker offline
+        misses = self._miss_counts.get(speaker.id, 0) + 1
+        self._miss_counts[speaker.id] = misses
+        if misses >= self.MISSES_BEFORE_OFFLINE and speaker.state != SpeakerState.OFFLINE:
+            speaker.state = SpeakerState.OFFLINE
+            self._update_speaker(speaker)
+
     async def refresh_speakers(self) -> list[NetworkSpeaker]:
         """
         Perform a single discovery scan.
@@ -338,17 +433,29 @@ class SpeakerPlugin(BasePlugin):
             logger.error(f"{self.name}: Failed to play theme on {speaker_id}: {e}")
             return False
 
-    async def stop_all(self) -> dict[str, bool]:
+    async def _gather_results(self, speaker_ids: list[str], coros) -> dict[str, bool]:
+        """Run per-speaker commands concurrently and map results by speaker ID."""
+        results = await asyncio.gather(*coros, return_exceptions=True)
+        return {
+            speaker_id: result is True
+            for speaker_id, result in zip(speaker_ids, results)
+        }
+
+    async def stop_all(self, ids: Optional[list[str]] = None) -> dict[str, bool]:
         """
-        Stop playback on all speakers.
+        Stop playback on several speakers concurrently.
+
+        Args:
+            ids: Speaker IDs to stop (default: all known speakers)
 
         Returns:
             Dict mapping speaker_id to success status
         """
-        results = {}
-        for speaker_id in self._speakers:
-            results[speaker_id] = await self.stop(speaker_id)
-        return results
+        speaker_ids = list(self._speakers) if ids is None else list(ids)
+        return await self._gather_results(
+            speaker_ids,
+            (self.stop(sid) for sid in speaker_ids)
+        )
 
     # --- Lifecycle ---
 
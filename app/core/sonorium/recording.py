@@ -266,11 +266,23 @@ class RecordingThemeInstance:
         self.theme = theme  # Reference to parent ThemeDefinition for threshold access
         self.volume = 1.0  # Amplitude multiplier (keep at 1.0 for now)
         self.presence = 1.0  # How often this track plays: 1.0 = always, 0.5 = half the time, 0 = never
-        self.is_enabled = True  # Master enable/disable (mute)
+        self._is_enabled = True  # Master enable/disable (mute)
         self.crossfade_enabled = True  # Enable crossfade looping by default
         self.playback_mode = PlaybackMode.AUTO  # How playback/looping is handled
         self.exclusive = False  # If True, only one exclusive track can play at a time
 
+    @property
+    def is_enabled(self) -> bool:
+        return self._is_enabled
+
+    @is_enabled.setter
+    def is_enabled(self, value: bool):
+        changed = value != self._is_enabled
+        self._is_enabled = value
+        # Let live theme streams refresh their list of enabled tracks
+        if changed and self.theme is not None:
+            self.theme.on_track_enabled_changed()
+
     @property
     def short_file_threshold(self) -> float:
         """Get the short file threshold from theme, or use default"""
@@ -313,7 +325,19 @@ class RecordingThemeInstance:
         return self.meta.name
 
 
-class RecordingThemeStream:
+class _MixBufferReader:
+    """Adds read_into() to streams whose ``gen`` yields (1, CHUNK_SIZE) float32 chunks."""
+
+    def read_into(self, out: np.ndarray, add: bool = False):
+        """Write the next chunk into a float32 mix buffer, or add to it if add is True."""
+        chunk = next(self.gen)[0]
+        if add:
+            np.add(out, chunk, out=out)
+        else:
+            np.copyto(out, chunk)
+
+
+class RecordingThemeStream(_MixBufferReader):
     """
     Basic recording stream without crossfade - loops with hard cut.
     """
@@ -404,7 +428,7 @@ class RecordingThemeStream:
         return next(self.gen)
 
 
-class CrossfadeRecordingStream:
+class CrossfadeRecordingStream(_MixBufferReader):
     """
     Recording stream with crossfade looping - seamlessly blends end of track into beginning.
 
@@ -615,7 +639,7 @@ class CrossfadeRecordingStream:
         return next(self.gen)
 
 
-class SparsePlaybackStream:
+class SparsePlaybackStream(_MixBufferReader):
     """
     Stream for short audio files (< 15 seconds) that plays the file once,
     then outputs silence for a randomized interval before playing again.
@@ -837,7 +861,7 @@ class SparsePlaybackStream:
         return next(self.gen)
 
 
-class PresenceMixingStream:
+class PresenceMixingStream(_MixBufferReader):
     """
     Wrapper stream that controls track presence in the mix.
 
@@ -4,7 +4,11 @@ Theme definitions for Sonorium.
 Standalone version without fmtr.tools dependencies.
 """
 
+import asyncio
+import functools
 import json
+import math
+import os
 import re
 import time
 from functools import cached_property
@@ -13,13 +17,30 @@ from pathlib import Path
 import numpy as np
 
 from sonorium.obs import logger
-from sonorium.recording import LOG_THRESHOLD, ExclusionGroupCoordinator, PlaybackMode
+from sonorium.recording import LOG_THRESHOLD, ExclusionGroupCoordinator, PlaybackMode, RecordingThemeStream
 
 try:
     import av
 except ImportError:
     from sonorium._av_compat import av
 
+# orjson is optional; it's considerably faster than stdlib json for metadata files.
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so error handling is shared.
+try:
+    import orjson
+
+    def _loads(data: bytes):
+        return orjson.loads(data)
+
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    def _loads(data: bytes):
+        return json.loads(data)
+
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, indent=2).encode('utf-8')
+
 # Default output gain multiplier (now controlled via device.master_volume)
 DEFAULT_OUTPUT_GAIN = 6.0
 
@@ -27,34 +48,60 @@ DEFAULT_OUTPUT_GAIN = 6.0
 DEFAULT_SHORT_FILE_THRESHOLD = 15.0
 
 
+# Runs of special chars and/or underscores, each collapsed to a single underscore
+_SANITIZE_RE = re.compile(r'(?:[^\w\-]|_)+')
+
+
 def sanitize(text: str) -> str:
     """Sanitize a string for use as an ID."""
-    # Replace spaces and special chars with underscores
-    text = re.sub(r'[^\w\-]', '_', text)
-    # Remove consecutive underscores
-    text = re.sub(r'_+', '_', text)
+    # Replace spaces and special chars with underscores, collapsing runs
+    text = _SANITIZE_RE.sub('_', text)
     # Remove leading/trailing underscores
     text = text.strip('_')
     return text.lower()
 
 
 class IndexList(list):
-    """List that supports dict-like access by item name/id attribute."""
+    """
+    List that supports dict-like access by item name/id attribute.
+
+    Lookups are memoized per attribute and dropped whenever the list is mutated,
+    so they assume indexed attributes (id, name, ...) don't change on the items.
+    """
 
     def __getattr__(self, name):
         """Allow attribute-style access to grouped items."""
         if name.startswith('_'):
             raise AttributeError(name)
 
-        # Return a dict mapping the attribute value to item
-        result = {}
-        for item in self:
-            if hasattr(item, name):
-                key = getattr(item, name)
-                result[key] = item
+        indices = self.__dict__.setdefault('_indices', {})
+        result = indices.get(name)
+        if result is None:
+            # Build a dict mapping the attribute value to item
+            result = {}
+            for item in self:
+                if hasattr(item, name):
+                    key = getattr(item, name)
+                    result[key] = item
+            indices[name] = result
         return result
 
 
+def _invalidating(method):
+    """Wrap a list mutator so it drops memoized IndexList lookups."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        self.__dict__.pop('_indices', None)
+        return method(self, *args, **kwargs)
+    return wrapper
+
+
+for _name in ('append', 'extend', 'insert', 'remove', 'pop', 'clear', 'sort', 'reverse',
+              '__setitem__', '__delitem__', '__iadd__', '__imul__'):
+    setattr(IndexList, _name, _invalidating(getattr(list, _name)))
+del _name
+
+
 class ThemeDefinition:
     """
     A theme is a collection of audio files that play together.
@@ -70,6 +117,11 @@ class ThemeDefinition:
         # Short file threshold (seconds) - files shorter than this use sparse playback
         self.short_file_threshold = DEFAULT_SHORT_FILE_THRESHOLD
 
+        self.streams: list['ThemeStream'] = []
+
+        # Hash of the last metadata.json payload written, to skip no-op saves
+        self._last_saved_hash = None
+
         # Load metadata.json if exists
         self._metadata = {}
         self._load_metadata()
@@ -86,8 +138,6 @@ class ThemeDefinition:
         # Apply track settings from metadata
         self._apply_track_settings()
 
-        self.streams: list['ThemeStream'] = []
-
     def _get_metadata_path(self) -> Path:
         """Get path to metadata.json for this theme."""
         return self.sonorium.path_audio / self.name / 'metadata.json'
@@ -98,8 +148,7 @@ class ThemeDefinition:
         logger.debug(f'Looking for metadata at: {meta_path}')
         if meta_path.exists():
             try:
-                with open(meta_path, 'r', encoding='utf-8') as f:
-                    self._metadata = json.load(f)
+                self._metadata = _loads(meta_path.read_bytes())
                 # Apply theme-level settings
                 if 'short_file_threshold' in self._metadata:
                     self.short_file_threshold = float(self._metadata['short_file_threshold'])
@@ -171,9 +220,27 @@ class ThemeDefinition:
         if 'name' not in self._metadata:
             self._metadata['name'] = self.name
 
+        # Write to a temp file and rename over the original, so a crash mid-write
+        # can't leave a truncated metadata.json behind
+        tmp_path = meta_path.with_name(meta_path.name + '.tmp')
         try:
-            with open(meta_path, 'w', encoding='utf-8') as f:
-                json.dump(self._metadata, f, indent=2)
+            payload = _dumps(self._metadata)
+            payload_hash = hash(payload)
+            if payload_hash == self._last_saved_hash:
+                logger.debug(f'Metadata for theme {self.name} unchanged, skipping save')
+                return
+
+            try:
+                tmp_path.write_bytes(payload)
+                os.replace(tmp_path, meta_path)
+            except BaseException:
+                # Don't leave metadata.json.tmp behind in the theme folder
+                try:
+                    tmp_path.unlink(missing_ok=True)
+                except OSError:
+                    pass
+                raise
+            self._last_saved_hash = payload_hash
             logger.info(f'Saved metadata for theme: {self.name}')
         except PermissionError as e:
             logger.error(f'Permission denied saving metadata for {self.name}: {e}. Check that the themes folder is writable.')
@@ -232,6 +299,21 @@ class ThemeDefinition:
     def id(self):
         return sanitize(self.name)
 
+    @cached_property
+    def exclusion_coordinator(self) -> ExclusionGroupCoordinator:
+        """Exclusion coordinator shared by all streams, for themes with shared_exclusion set."""
+        return ExclusionGroupCoordinator()
+
+    def on_track_enabled_changed(self):
+        """Called by an instance when it is muted or unmuted."""
+        for stream in self.streams:
+            stream.rebuild_active()
+
+    def set_output_gain(self, gain: float):
+        """Push a new output gain to all live streams of this theme."""
+        for stream in self.streams:
+            stream.output_gain = gain
+
     def get_stream(self):
         theme = ThemeStream(self)
         self.streams.append(theme)
@@ -245,60 +327,94 @@ class ThemeStream:
 
     One instance per client/connection. Has a RecordingStream for each recording in the ThemeDefinition.
     """
+    # Samples per MP3 encoder frame: a multiple of both the mix chunk size (1024)
+    # and the MP3 frame size (1152), so chunks fill it exactly (~209 ms)
+    FRAME_SAMPLES = 9_216
+
+    # Mix normalization 1/sqrt(n) by track count; 0 and 1 tracks are left unscaled
+    _INV_SQRT = (1.0, 1.0) + tuple(1.0 / math.sqrt(n) for n in range(2, 65))
 
     def __init__(self, theme_def: ThemeDefinition):
         self.theme_def = theme_def
 
-        # Create shared exclusion coordinator for tracks marked as exclusive
-        self.exclusion_coordinator = ExclusionGroupCoordinator()
+        # Exclusion coordinator for tracks marked as exclusive. Per stream by default, so each
+        # client gets its own exclusive rotation; themes can opt into one theme-wide coordinator.
+        if theme_def._metadata.get('shared_exclusion', False):
+            self.exclusion_coordinator = theme_def.exclusion_coordinator
+        else:
+            self.exclusion_coordinator = ExclusionGroupCoordinator()
 
         # Create streams, passing the exclusion coordinator
         self.recording_streams = [
             instance.get_stream(exclusion_coordinator=self.exclusion_coordinator)
             for instance in theme_def.instances
         ]
+        self.rebuild_active()
+
+        # Output gain, cached here and updated by ThemeDefinition.set_output_gain
+        self.output_gain = getattr(theme_def.sonorium, 'master_volume', DEFAULT_OUTPUT_GAIN)
+
+        # Mix accumulator, reused for every chunk instead of stacking all tracks
+        self._acc = np.zeros(RecordingThemeStream.CHUNK_SIZE, np.float32)
+
+    def rebuild_active(self):
+        """Refresh the list of streams whose track is enabled."""
+        # Swapped in whole, so the mixing loop can keep iterating the old list
+        self._active_streams = [s for s in self.recording_streams if s.instance.is_enabled]
 
     @cached_property
     def chunk_silence(self):
-        from sonorium.recording import RecordingThemeStream
         data = np.zeros((1, RecordingThemeStream.CHUNK_SIZE), np.int16)
         return data
 
     def iter_chunks(self):
         """Generate mixed audio chunks from all enabled recordings."""
-        while True:
-            data_recs = [
-                next(streams)
-                for streams in self.recording_streams
-                if streams.instance.is_enabled
-            ]
-
-            if not data_recs:
-                data_recs.append(self.chunk_silence)
-
-            # Stack all recordings
-            data = np.vstack(data_recs)
-
-            # Proper audio mixing: sum the signals, then normalize
-            mixed = data.astype(np.float32).sum(axis=0)
-
-            # Normalize by sqrt(n) to prevent clipping
-            n_tracks = len(data_recs)
-            if n_tracks > 1:
-                mixed = mixed / np.sqrt(n_tracks)
-
-            # Apply output gain
-            output_gain = getattr(self.theme_def.sonorium, 'master_volume', DEFAULT_OUTPUT_GAIN)
-            mixed = mixed * output_gain
+        try:
+            yield from self._mix_chunks()
+        finally:
+            # Consumer is gone: stop receiving gain and mute updates
+            try:
+                self.theme_def.streams.remove(self)
+            except ValueError:
+                pass
 
-            # Clip to int16 range
-            mixed = np.clip(mixed, -32768, 32767)
-            data = mixed.astype(np.int16).reshape(1, -1)
+    def _mix_chunks(self):
+        acc = self._acc
+        while True:
+            # Proper audio mixing: sum the signals in place, then normalize.
+            # The first track overwrites the accumulator, later ones add to it.
+            n_tracks = 0
+            for stream in self._active_streams:
+                stream.read_into(acc, add=n_tracks > 0)
+                n_tracks += 1
+
+            # Nothing enabled: skip the mixing math entirely
+            if not n_tracks:
+                yield self.chunk_silence
+                continue
+
+            # Output gain, normalized by sqrt(n) to prevent clipping, applied in one pass
+            if n_tracks < len(self._INV_SQRT):
+                inv_sqrt = self._INV_SQRT[n_tracks]
+            else:
+                inv_sqrt = 1.0 / math.sqrt(n_tracks)
+            acc *= self.output_gain * inv_sqrt
+
+            # Clip to int16 range. The output is a fresh array since consumers
+            # (e.g. the channel broadcast buffer) keep references to chunks.
+            np.clip(acc, -32768, 32767, out=acc)
+            data = np.empty((1, acc.shape[0]), np.int16)
+            np.copyto(data[0], acc, casting='unsafe')
 
             yield data
 
-    def __iter__(self):
-        """Iterate as MP3 stream for HTTP streaming."""
+    def _iter_encoded(self):
+        """
+        Encode mixed chunks as MP3, without pacing.
+
+        Yields (packets, duration) per frame, where packets is a list of MP3 bytes
+        and duration is the audio time covered in seconds.
+        """
         from io import BytesIO
 
         # Create in-memory MP3 encoder (stereo for AirPlay compatibility)
@@ -312,39 +428,92 @@ class ThemeStream:
 
         iter_chunks = self.iter_chunks()
 
+        # Chunks are batched into one larger frame per encoder call. The frame is
+        # allocated once and filled in place through NumPy views of its planes;
+        # the encoder copies samples out on each encode() call.
+        frame = av.AudioFrame(format='s16p', layout='stereo', samples=self.FRAME_SAMPLES)
+        frame.rate = 44100
+        planes = [np.frombuffer(plane, dtype=np.int16)[:self.FRAME_SAMPLES] for plane in frame.planes]
+        pos = 0
+
+        try:
+            for data in iter_chunks:
+                # Convert mono to stereo for AirPlay/pyatv compatibility
+                # data shape is (1, samples), copied into both channel planes
+                end = pos + data.shape[1]
+                for plane in planes:
+                    plane[pos:end] = data[0]
+                pos = end
+                if pos < self.FRAME_SAMPLES:
+                    continue
+                pos = 0
+
+                packets = [bytes(packet) for packet in out_stream.encode(frame)]
+                yield packets, frame.samples / frame.rate
+
+        finally:
+            logger.info('Closing transcoder...')
+            iter_chunks.close()
+            output.close()
+
+    def __iter__(self):
+        """Iterate as MP3 stream for HTTP streaming."""
+        encoded = self._iter_encoded()
+
         start_time = time.time()
         audio_time = 0.0
 
         try:
-            while True:
-                for i, data in enumerate(iter_chunks):
-                    # Convert mono to stereo for AirPlay/pyatv compatibility
-                    # data shape is (1, samples), need (2, samples)
-                    if data.shape[0] == 1:
-                        stereo_data = np.vstack([data, data])
-                    else:
-                        stereo_data = data
+            for i, (packets, frame_duration) in enumerate(encoded):
+                audio_time += frame_duration
+                yield from packets
 
-                    frame = av.AudioFrame.from_ndarray(stereo_data, format='s16p', layout='stereo')
-                    frame.rate = 44100
+                # Maintain real-time pacing
+                ahead = audio_time - (time.time() - start_time)
+                if ahead > 0:
+                    time.sleep(ahead)
 
-                    frame_duration = frame.samples / frame.rate
-                    audio_time += frame_duration
+                if i % LOG_THRESHOLD == 0:
+                    logger.debug(f'Streaming {audio_time:.1f}s...')
+        finally:
+            encoded.close()
 
-                    for packet in out_stream.encode(frame):
-                        packet_bytes = bytes(packet)
-                        yield packet_bytes
+    async def __aiter__(self):
+        """
+        Iterate as MP3 stream for async consumers (e.g. StreamingResponse).
 
-                    # Maintain real-time pacing
-                    now = time.time()
-                    ahead = audio_time - (now - start_time)
-                    if ahead > 0:
-                        time.sleep(ahead)
+        Encoding runs in a worker thread, but pacing waits on the event loop, so
+        no thread is held while the stream is ahead of real time.
+        """
+        encoded = self._iter_encoded()
+        pending = None
 
-                    if i % LOG_THRESHOLD == 0:
-                        logger.debug(f'Streaming {audio_time:.1f}s...')
+        start_time = time.time()
+        audio_time = 0.0
+        i = 0
 
+        try:
+            while True:
+                # Shielded so a disconnecting client can't close the encoder mid-call
+                pending = asyncio.ensure_future(asyncio.to_thread(next, encoded, None))
+                item = await asyncio.shield(pending)
+                if item is None:
+                    break
+
+                packets, frame_duration = item
+                audio_time += frame_duration
+                for packet in packets:
+                    yield packet
+
+                # Maintain real-time pacing
+                ahead = audio_time - (time.time() - start_time)
+                if ahead > 0:
+                    await asyncio.sleep(ahead)
+
+                if i % LOG_THRESHOLD == 0:
+                    logger.debug(f'Streaming {audio_time:.1f}s...')
+                i += 1
         finally:
-            logger.info('Closing transcoder...')
-            iter_chunks.close()
-            output.close()
+            if pending is not None and not pending.done():
+                await asyncio.wait([pending])
+            encoded.close()
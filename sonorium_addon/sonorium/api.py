@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from pathlib import Path
 
@@ -45,6 +46,7 @@ class ApiSonorium(api.Base):
         self._state_store = None
         self._ha_registry = None
         self._media_controller = None
+        self._prewarm_task = None
         self._session_manager = None
         self._group_manager = None
         self._channel_manager = None
@@ -184,6 +186,7 @@ class ApiSonorium(api.Base):
             
             # Initialize media controller
             self._media_controller = HAMediaController(api_url, settings.token)
+            self._prewarm_task = asyncio.create_task(self._media_controller.prewarm())
             
             # Use configured stream URL (from SONORIUM__STREAM_URL env var)
             stream_base_url = settings.stream_url
@@ -411,9 +414,13 @@ class ApiSonorium(api.Base):
 
     async def shutdown_v2(self):
         """Shutdown v2 components gracefully."""
+        if self._mqtt_manager:
+            await self._mqtt_manager.stop()
         if self._cycle_manager:
             await self._cycle_manager.stop()
             logger.info("CycleManager stopped")
+        if self._media_controller:
+            await self._media_controller.close()
 
     async def web_ui(self):
         """Serve the main web UI (v2 if available, else v1)."""
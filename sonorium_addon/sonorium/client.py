@@ -5,6 +5,10 @@ Replaces the HACO-based client with a simpler paho-mqtt implementation
 that integrates with SonoriumMQTTManager for HA entity management.
 """
 import asyncio
+import json
+import os
+import time
+from pathlib import Path
 from typing import Callable, Awaitable
 
 import paho.mqtt.client as paho_mqtt
@@ -13,6 +17,47 @@ from sonorium.api import ApiSonorium
 from sonorium.device import Sonorium
 from sonorium.obs import logger
 
+# Supervisor MQTT service details are cached across restarts, since they rarely change.
+# /data is private to the addon, but the file holds credentials, so it is written 0600.
+MQTT_CACHE_PATH = Path("/data/mqtt_cache.json")
+MQTT_CACHE_MAX_AGE = 24 * 60 * 60
+# Connect timeout when using cached details, so a stale cache falls back to Supervisor quickly
+MQTT_CACHED_CONNECT_TIMEOUT = 10
+
+
+def _load_mqtt_cache() -> dict | None:
+    """Return cached Supervisor MQTT config if present and fresh."""
+    try:
+        cached = json.loads(MQTT_CACHE_PATH.read_text())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(cached, dict) or not cached.get('host'):
+        return None
+    if time.time() - cached.get('timestamp', 0) > MQTT_CACHE_MAX_AGE:
+        return None
+    return cached
+
+
+def _save_mqtt_cache(host: str, port: int, username: str | None, password: str | None):
+    """Persist Supervisor MQTT config for the next start."""
+    data = dict(host=host, port=port, username=username, password=password, timestamp=time.time())
+    tmp_path = MQTT_CACHE_PATH.with_suffix('.tmp')
+    try:
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, MQTT_CACHE_PATH)
+    except OSError as e:
+        logger.debug(f"  Could not write MQTT cache: {e}")
+
+
+def _clear_mqtt_cache():
+    """Remove cached Supervisor MQTT config."""
+    try:
+        MQTT_CACHE_PATH.unlink(missing_ok=True)
+    except OSError:
+        pass
+
 
 class MQTTClient:
     """
@@ -90,7 +135,7 @@ class MQTTClient:
         """Set the async message handler for incoming MQTT messages."""
         self._message_handler = handler
 
-    async def connect(self):
+    async def connect(self, timeout: float = 30):
         """Connect to the MQTT broker."""
         logger.info(f"Connecting to MQTT broker at {self.hostname}:{self.port}...")
 
@@ -102,7 +147,7 @@ class MQTTClient:
 
         # Wait for connection with timeout
         try:
-            await asyncio.wait_for(self._connected.wait(), timeout=30)
+            await asyncio.wait_for(self._connected.wait(), timeout=timeout)
         except asyncio.TimeoutError:
             raise RuntimeError(f"MQTT connection timeout to {self.hostname}:{self.port}")
 
@@ -155,6 +200,8 @@ class ClientSonorium:
         password: str | None = None,
     ):
         self.device = device
+        # True when the broker details came from MQTT_CACHE_PATH rather than a live lookup
+        self.mqtt_config_cached = False
         self._mqtt = MQTTClient(
             hostname=hostname,
             port=port,
@@ -175,7 +222,22 @@ class ClientSonorium:
     async def start(self):
         """Start the MQTT client and API server."""
         # Connect to MQTT broker
-        await self._mqtt.connect()
+        try:
+            if self.mqtt_config_cached:
+                await self._mqtt.connect(timeout=MQTT_CACHED_CONNECT_TIMEOUT)
+            else:
+                await self._mqtt.connect()
+        except RuntimeError:
+            if not self.mqtt_config_cached:
+                raise
+            # Cached broker details may be stale - ask Supervisor again
+            logger.warning("  Cached MQTT config failed, re-querying Supervisor API...")
+            await self._mqtt.disconnect()
+            _clear_mqtt_cache()
+            config, _ = await self._resolve_mqtt_config(use_cache=False)
+            self._mqtt = MQTTClient(**config)
+            self.mqtt_config_cached = False
+            await self._mqtt.connect()
 
         # Launch the API server
         await self.API_CLASS.launch_async(self)
@@ -186,19 +248,28 @@ class ClientSonorium:
 
     @classmethod
     @logger.instrument('Instantiating MQTT client...')
-    def from_supervisor(cls, device: Sonorium, **kwargs):
+    async def from_supervisor(cls, device: Sonorium, **kwargs):
         """
         Create MQTT client with configuration from environment/settings.
 
         Configuration priority (handled in run.sh before Python starts):
         1. Manual config from addon options (sonorium__mqtt_host != "auto")
         2. Auto-detect via bashio::services mqtt (recommended HA method)
-        3. Fallback: Direct Supervisor API call (this code, if above failed)
+        3. Fallback: Direct Supervisor API call (this code, if above failed),
+           using the cached result of a previous call while it is fresh
 
         Username/password are optional (allows anonymous connections).
         """
-        import urllib.request
-        import json
+        config, cached = await cls._resolve_mqtt_config()
+
+        client = cls(device=device, **config, **kwargs)
+        client.mqtt_config_cached = cached
+        return client
+
+    @staticmethod
+    async def _resolve_mqtt_config(use_cache: bool = True) -> tuple[dict, bool]:
+        """Work out MQTT broker details as MQTTClient keyword arguments, and whether they came from the cache."""
+        import httpx
         from sonorium.settings import settings
 
         # Get config from environment (set by run.sh via bashio::services or manual config)
@@ -214,21 +285,32 @@ class ClientSonorium:
             mqtt_port = 1883
             logger.info(f"  MQTT host configured, using default port: {mqtt_port}")
 
+        # Reuse Supervisor details from a previous start before calling the API again
+        cached = False
+        if not mqtt_host and use_cache:
+            cache = _load_mqtt_cache()
+            if cache:
+                mqtt_host = cache['host']
+                mqtt_port = cache.get('port') or 1883
+                mqtt_username = mqtt_username or cache.get('username')
+                mqtt_password = mqtt_password or cache.get('password')
+                cached = True
+                logger.info(f"  Using cached Supervisor MQTT config: {mqtt_host}:{mqtt_port}")
+
         # Fallback: Try Supervisor API directly if bashio::services didn't provide config
         # This is a backup - bashio::services in run.sh should have already set these
         if not mqtt_host:
             logger.info("  MQTT not configured, trying Supervisor API fallback...")
             try:
                 url = f"{settings.ha_supervisor_api}/services/mqtt"
-                req = urllib.request.Request(
-                    url,
-                    headers={
-                        "Authorization": f"Bearer {settings.token}",
-                        "Content-Type": "application/json",
-                    },
-                )
-                with urllib.request.urlopen(req, timeout=10) as response:
-                    response_json = json.loads(response.read().decode())
+                headers = {
+                    "Authorization": f"Bearer {settings.token}",
+                    "Content-Type": "application/json",
+                }
+                async with httpx.AsyncClient(timeout=10.0) as http_client:
+                    response = await http_client.get(url, headers=headers)
+                    response.raise_for_status()
+                    response_json = response.json()
 
                 # Handle both response formats: direct fields or wrapped in "data"
                 data = response_json.get("data", response_json)
@@ -242,10 +324,11 @@ class ClientSonorium:
                     if not mqtt_password and 'password' in data:
                         mqtt_password = data.get('password')
                     logger.info(f"  Got MQTT config from Supervisor API: {mqtt_host}:{mqtt_port}")
+                    _save_mqtt_cache(mqtt_host, mqtt_port, data.get('username'), data.get('password'))
                 else:
                     logger.warning("  Supervisor API returned no MQTT service data")
-            except urllib.error.HTTPError as e:
-                logger.warning(f"  Supervisor API error: HTTP {e.code} - {e.reason}")
+            except httpx.HTTPStatusError as e:
+                logger.warning(f"  Supervisor API error: HTTP {e.response.status_code} - {e.response.reason_phrase}")
             except Exception as e:
                 logger.warning(f"  Supervisor API fallback failed: {type(e).__name__}: {e}")
 
@@ -264,12 +347,10 @@ class ClientSonorium:
         auth_status = "with credentials" if mqtt_username else "anonymous"
         logger.info(f"  MQTT config: {mqtt_host}:{mqtt_port} ({auth_status})")
 
-        # Create client
-        return cls(
-            device=device,
+        config = dict(
             hostname=mqtt_host,
             port=mqtt_port,
             username=mqtt_username,
             password=mqtt_password,
-            **kwargs
         )
+        return config, cached
@@ -18,17 +18,52 @@ IP Resolution:
 from __future__ import annotations
 
 import asyncio
+import ipaddress
+import json
+import os
+import re
+import time
 import uuid
+from pathlib import Path
 from typing import Optional, TYPE_CHECKING
-from concurrent.futures import ThreadPoolExecutor
 
 from sonorium.obs import logger
 
 if TYPE_CHECKING:
     from sonorium.ha.media_controller import HAMediaController
 
-# pychromecast is a blocking library, so we run it in a thread pool
-_executor = ThreadPoolExecutor(max_workers=4)
+# orjson is optional; the device registry listing can be large on big installs.
+# HA expects text frames, so encoded messages are decoded back to str.
+try:
+    import orjson
+
+    def _ws_loads(data):
+        return orjson.loads(data)
+
+    def _ws_dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+except ImportError:
+    def _ws_loads(data):
+        return json.loads(data)
+
+    def _ws_dumps(obj) -> str:
+        return json.dumps(obj)
+
+# pychromecast is a blocking library, so its calls run in worker threads.
+# Cap how many connect/play requests may be in flight at once.
+MAX_CONCURRENT_PLAYS = 16
+
+# How long device registry IPs are trusted before re-querying HA (seconds)
+HA_DEVICE_IPS_TTL = 300
+# Retry delay when a registry query finds nothing (e.g. HA unreachable)
+HA_DEVICE_IPS_RETRY = 60
+
+# Registry and detection caches are saved here so a restart within
+# HA_DEVICE_IPS_TTL can skip the registry query
+CAST_CACHE_PATH = Path("/data/cast_cache.json")
+
+# How long an mDNS scan result is reused before scanning again (seconds)
+MDNS_DISCOVERY_TTL = 300
 
 # Entity ID patterns that indicate Cast devices
 CAST_ENTITY_PATTERNS = [
@@ -44,24 +79,113 @@ CAST_ENTITY_PATTERNS = [
 ]
 
 # Manufacturer strings that indicate Cast devices
-CAST_MANUFACTURERS = [
+CAST_MANUFACTURERS = frozenset({
     'google',
     'google inc',
     'google inc.',
     'google llc',
-]
+})
 
 # Integration identifiers for Cast
-CAST_INTEGRATIONS = [
+CAST_INTEGRATIONS = frozenset({
     'cast',
     'google_cast',
-]
+})
+
+# Compiled forms of the entity patterns, used on the detection hot path
+_CAST_PATTERN_RE = re.compile('|'.join(re.escape(p) for p in CAST_ENTITY_PATTERNS))
+_CAST_NAME_RE = re.compile('|'.join(re.escape(p.replace('_', ' ')) for p in CAST_ENTITY_PATTERNS))
+_NAME_SPLIT_RE = re.compile(r'[\s_\-]+')
+_URL_IP_RE = re.compile(r'://(\d{1,3}(?:\.\d{1,3}){3})')
 
 
 def _is_cast_by_entity_pattern(entity_id: str) -> bool:
     """Check if entity ID matches Cast device patterns."""
-    entity_lower = entity_id.lower()
-    return any(pattern in entity_lower for pattern in CAST_ENTITY_PATTERNS)
+    # Only the object id can match; patterns may appear anywhere in it
+    # (e.g. 'living_room_speaker_2'), so this stays a search, not a prefix/suffix test.
+    object_id = entity_id.rpartition('.')[2]
+    return _CAST_PATTERN_RE.search(object_id.lower()) is not None
+
+
+def _is_media_player(entity_id: str) -> bool:
+    """Cast devices only appear as media_player entities; anything else can be ruled out without I/O."""
+    domain, sep, _ = entity_id.partition('.')
+    return not sep or domain == 'media_player'
+
+
+def _normalize_device_name(name: str) -> str:
+    """Lowercase a device/entity name and collapse spaces, dashes and underscores to '_'."""
+    return '_'.join(_NAME_SPLIT_RE.split(name.lower())).strip('_')
+
+
+def _is_usable_device_ip(ip: str) -> bool:
+    """Check that a registry-supplied address is a well-formed IPv4 address a Cast device could have."""
+    try:
+        address = ipaddress.IPv4Address(ip)
+    except ValueError:
+        return False
+    return not (
+        address.is_unspecified or
+        address.is_loopback or
+        address.is_link_local or
+        address.is_multicast
+    )
+
+
+def _extract_cast_ips(devices: list[dict]) -> dict[str, str]:
+    """
+    Pick Cast devices out of a device registry listing and map their names to IPs.
+
+    Names are keyed both lowercase and with spaces replaced by underscores.
+    Devices are filtered on cheap string checks first; only matches have
+    their configuration_url and connections inspected.
+    """
+    cast_ips = {}
+
+    for device in devices:
+        name = (device.get('name') or '').lower()
+        manufacturer = (device.get('manufacturer') or '').lower()
+
+        # Broader Cast detection - include 'nest', 'chromecast', 'google' in name
+        is_cast = (
+            manufacturer in CAST_MANUFACTURERS or
+            'cast' in str(device.get('identifiers') or '').lower() or
+            'nest' in name or
+            'chromecast' in name or
+            'google home' in name
+        )
+        if not is_cast:
+            continue
+
+        name_normalized = name.replace(' ', '_')
+
+        # Try configuration_url - often contains IP
+        config_url = device.get('configuration_url') or ''
+        ip_match = _URL_IP_RE.search(config_url)
+        if ip_match and _is_usable_device_ip(ip_match.group(1)):
+            ip = ip_match.group(1)
+            cast_ips[name] = ip
+            cast_ips[name_normalized] = ip
+            logger.info(f"  Cast: Found '{name}' at {ip} from configuration_url")
+            continue
+
+        # Try connections field
+        connections = device.get('connections') or []
+        for conn in connections:
+            if (
+                isinstance(conn, (list, tuple)) and len(conn) >= 2 and
+                conn[0] == 'ip' and _is_usable_device_ip(str(conn[1]))
+            ):
+                cast_ips[name] = conn[1]
+                cast_ips[name_normalized] = conn[1]
+                logger.info(f"  Cast: Found '{name}' at {conn[1]} from connections")
+                break
+        else:
+            logger.debug(f"  Cast: Device '{name}' (mfr: {manufacturer}) has no IP in config_url or connections")
+            logger.debug(f"  Cast:   config_url: {config_url}")
+            logger.debug(f"  Cast:   connections: {connections}")
+
+    return cast_ips
 
 
 def _is_cast_by_attributes(attributes: dict) -> bool:
@@ -88,6 +212,68 @@ def _is_cast_by_attributes(attributes: dict) -> bool:
     return False
 
 
+class _PlaybackWaiter:
+    """
+    pychromecast media status listener that wakes an asyncio waiter.
+
+    pychromecast delivers status updates on its socket thread, so results are
+    handed to the event loop with call_soon_threadsafe. One waiter is registered
+    per connection and re-armed with reset() before each play request.
+
+    Because connections are reused, a status for the previously loaded media
+    can arrive after re-arming. Updates naming a different content_id, or
+    belonging to the media session that was active before the request was
+    sent, are ignored so they don't resolve the new request. Callers must
+    serialize requests per waiter (CastPlayer holds a per-entity lock).
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self._loop = loop
+        self.event = asyncio.Event()
+        self.content_id: Optional[str] = None
+        self.stale_session_id: Optional[int] = None
+        self.player_state: Optional[str] = None
+        self.idle_reason: Optional[str] = None
+
+    def reset(self, content_id: Optional[str] = None):
+        self.event = asyncio.Event()
+        self.content_id = content_id
+        self.stale_session_id = None
+        self.player_state = None
+        self.idle_reason = None
+
+    def _resolve(
+        self,
+        player_state: Optional[str],
+        idle_reason: Optional[str],
+        content_id: Optional[str] = None,
+        session_id: Optional[int] = None,
+    ):
+        if self.event.is_set():
+            return
+        if content_id and self.content_id and content_id != self.content_id:
+            return
+        if session_id is not None and session_id == self.stale_session_id:
+            return
+        self.player_state = player_state
+        self.idle_reason = idle_reason
+        self.event.set()
+
+    def new_media_status(self, status):
+        # Called on pychromecast's socket thread
+        if status.player_state in ('PLAYING', 'BUFFERING'):
+            self._loop.call_soon_threadsafe(
+                self._resolve, status.player_state, None, status.content_id, status.media_session_id
+            )
+        elif status.idle_reason:
+            self._loop.call_soon_threadsafe(
+                self._resolve, None, status.idle_reason, status.content_id, status.media_session_id
+            )
+
+    def load_media_failed(self, queue_item_id, error_code):
+        self._loop.call_soon_threadsafe(self._resolve, None, f"LOAD_FAILED ({error_code})")
+
+
 class CastPlayer:
     """
     Direct Cast player using pychromecast.
@@ -96,6 +282,23 @@ class CastPlayer:
     Streams directly to Cast devices without going through HA's play_media.
     """
 
+    __slots__ = (
+        'media_controller',
+        '_ip_cache',
+        '_cast_cache',
+        '_ha_device_ips',
+        '_ha_device_index',
+        '_ha_device_tokens',
+        '_ha_ips_expiry',
+        '_mdns_results',
+        '_mdns_expiry',
+        '_mdns_task',
+        '_connections',
+        '_listeners',
+        '_play_locks',
+        '_play_sem',
+    )
+
     def __init__(self, media_controller: 'HAMediaController'):
         """
         Initialize with reference to media controller for HA API access.
@@ -110,20 +313,92 @@ class CastPlayer:
         self._cast_cache: dict[str, bool] = {}
         # Cache of device name -> IP from HA registry
         self._ha_device_ips: dict[str, str] = {}
-        self._ha_ips_loaded = False
+        # Lookup index over _ha_device_ips: normalized name variants -> IP,
+        # and name token -> normalized device names containing it
+        self._ha_device_index: dict[str, str] = {}
+        self._ha_device_tokens: dict[str, set[str]] = {}
+        self._ha_ips_expiry = 0.0
+        # Last mDNS scan results, and the scan in progress if any
+        self._mdns_results: list[tuple[str, str]] = []
+        self._mdns_expiry = 0.0
+        self._mdns_task: Optional[asyncio.Future] = None
         # Active Cast connections (entity_id -> Chromecast object)
         self._connections: dict[str, object] = {}
+        # Status listeners registered on those connections (entity_id -> waiter)
+        self._listeners: dict[str, _PlaybackWaiter] = {}
+        # Serializes play requests per entity, since they share one waiter
+        self._play_locks: dict[str, asyncio.Lock] = {}
+        self._play_sem = asyncio.Semaphore(MAX_CONCURRENT_PLAYS)
+
+        self._restore_cache()
+
+    def _restore_cache(self):
+        """Load caches saved by a previous run if they are younger than HA_DEVICE_IPS_TTL."""
+        try:
+            age = time.time() - CAST_CACHE_PATH.stat().st_mtime
+            if age >= HA_DEVICE_IPS_TTL:
+                return
+            data = json.loads(CAST_CACHE_PATH.read_text())
+            cast_cache = dict(data['cast_cache'])
+            device_ips = dict(data['device_ips'])
+        except (OSError, ValueError, KeyError, TypeError):
+            return
+
+        self._cast_cache = cast_cache
+        if not device_ips:
+            # An empty registry map is not worth skipping the query for
+            return
+        self._ha_device_ips = device_ips
+        self._index_device_ips()
+        self._ha_ips_expiry = time.monotonic() + HA_DEVICE_IPS_TTL - age
+        logger.info(f"  Cast: Restored {len(device_ips)} cached registry entries")
+
+    async def _save_cache(self):
+        """
+        Write caches to CAST_CACHE_PATH (atomically) for the next start.
+
+        Resolved entity IPs are not saved: a wrong one would otherwise survive
+        the restart that is meant to clear it.
+        """
+        text = json.dumps(dict(
+            cast_cache=self._cast_cache,
+            device_ips=self._ha_device_ips,
+        ))
+
+        def write():
+            tmp_path = CAST_CACHE_PATH.with_suffix('.tmp')
+            tmp_path.write_text(text)
+            os.replace(tmp_path, CAST_CACHE_PATH)
+
+        try:
+            await asyncio.to_thread(write)
+        except OSError as e:
+            logger.debug(f"  Cast: Could not save cache: {e}")
 
     async def _load_ha_device_ips(self):
-        """Load Cast device IPs from HA device registry."""
-        if self._ha_ips_loaded:
+        """
+        Load Cast device IPs from HA device registry, refreshing after HA_DEVICE_IPS_TTL.
+
+        If a refresh finds nothing (or fails), the previously loaded IPs are kept
+        and the query is retried after HA_DEVICE_IPS_RETRY.
+        """
+        now = time.monotonic()
+        if now < self._ha_ips_expiry:
             return
 
-        self._ha_ips_loaded = True
-        self._ha_device_ips = await self._get_cast_ips_from_ha()
+        self._ha_ips_expiry = now + HA_DEVICE_IPS_TTL
+        device_ips = await self._get_cast_ips_from_ha()
+
+        if device_ips:
+            self._ha_device_ips = device_ips
+            self._index_device_ips()
+            await self._save_cache()
+            logger.info(f"  Cast: Found {len(device_ips)} Cast device(s) in HA registry")
+            return
 
+        self._ha_ips_expiry = time.monotonic() + HA_DEVICE_IPS_RETRY
         if self._ha_device_ips:
-            logger.info(f"  Cast: Found {len(self._ha_device_ips)} Cast device(s) in HA registry")
+            logger.warning("  Cast: HA registry refresh found no Cast IPs, keeping previous results")
         else:
             logger.warning("  Cast: No Cast IPs found in HA device registry")
 
@@ -134,7 +409,6 @@ class CastPlayer:
         Returns dict mapping device/entity name (lowercase) -> IP address
         """
         from sonorium.ha.registry import WEBSOCKETS_AVAILABLE
-        import re
 
         if not WEBSOCKETS_AVAILABLE:
             logger.warning("  Cast: websockets not available for HA query")
@@ -142,7 +416,6 @@ class CastPlayer:
 
         try:
             import websockets
-            import json
 
             # Connect to HA WebSocket API
             token = self.media_controller.token
@@ -153,89 +426,37 @@ class CastPlayer:
             # Increase max_size for large HA installations (default 1MB is too small)
             async with websockets.connect(ws_url, max_size=10 * 1024 * 1024) as ws:
                 # Wait for auth_required
-                msg = json.loads(await ws.recv())
+                msg = _ws_loads(await ws.recv())
                 if msg.get('type') != 'auth_required':
                     logger.warning(f"  Cast: Unexpected WebSocket message: {msg}")
                     return {}
 
-                # Authenticate
-                await ws.send(json.dumps({
+                # Authenticate and queue the registry query in the same round trip.
+                # HA reads the query only after the auth phase completes.
+                await ws.send(_ws_dumps({
                     "type": "auth",
                     "access_token": token
                 }))
+                await ws.send(_ws_dumps({
+                    "id": 1,
+                    "type": "config/device_registry/list"
+                }))
 
-                msg = json.loads(await ws.recv())
+                msg = _ws_loads(await ws.recv())
                 if msg.get('type') != 'auth_ok':
                     logger.warning(f"  Cast: HA WebSocket auth failed: {msg}")
                     return {}
 
-                logger.info("  Cast: WebSocket authenticated, querying device registry...")
+                logger.info("  Cast: WebSocket authenticated, reading device registry...")
 
-                # Query device registry
-                await ws.send(json.dumps({
-                    "id": 1,
-                    "type": "config/device_registry/list"
-                }))
-
-                msg = json.loads(await ws.recv())
+                msg = _ws_loads(await ws.recv())
                 if not msg.get('success'):
                     logger.warning(f"  Cast: Device registry query failed: {msg}")
                     return {}
 
                 devices = msg.get('result', [])
-                cast_ips = {}
-
                 logger.debug(f"  Cast: Scanning {len(devices)} devices in registry")
-
-                for device in devices:
-                    # Check if it's a Cast device
-                    identifiers = device.get('identifiers', [])
-                    manufacturer = (device.get('manufacturer') or '').lower()
-                    name = (device.get('name') or '').lower()  # Handle None name
-
-                    # Broader Cast detection - include 'nest', 'chromecast', 'google' in name
-                    is_cast = (
-                        any('cast' in str(ident).lower() for ident in identifiers) or
-                        manufacturer in CAST_MANUFACTURERS or
-                        'nest' in name or
-                        'chromecast' in name or
-                        'google home' in name
-                    )
-
-                    if not is_cast:
-                        continue
-
-                    logger.debug(f"  Cast: Found Cast device '{name}' (mfr: {manufacturer})")
-
-                    name_normalized = name.replace(' ', '_')
-
-                    # Try configuration_url - often contains IP
-                    config_url = device.get('configuration_url', '')
-                    if config_url:
-                        ip_match = re.search(r'://(\d+\.\d+\.\d+\.\d+)', config_url)
-                        if ip_match:
-                            ip = ip_match.group(1)
-                            cast_ips[name] = ip
-                            cast_ips[name_normalized] = ip
-                            logger.info(f"  Cast: Found '{name}' at {ip} from configuration_url")
-                            continue
-
-                    # Try connections field
-                    connections = device.get('connections', [])
-                    for conn in connections:
-                        if isinstance(conn, (list, tuple)) and len(conn) >= 2:
-                            conn_type, conn_value = conn[0], conn[1]
-                            if conn_type == 'ip':
-                                cast_ips[name] = conn_value
-                                cast_ips[name_normalized] = conn_value
-                                logger.info(f"  Cast: Found '{name}' at {conn_value} from connections")
-                                break
-
-                    # If still no IP, log what we have for debugging
-                    if name not in cast_ips:
-                        logger.debug(f"  Cast: Device '{name}' has no IP in config_url or connections")
-                        logger.debug(f"  Cast:   config_url: {config_url}")
-                        logger.debug(f"  Cast:   connections: {connections}")
+                cast_ips = _extract_cast_ips(devices)
 
                 # If WebSocket found no IPs, try REST API fallback
                 if not cast_ips:
@@ -255,67 +476,101 @@ class CastPlayer:
         Fallback: Get Cast device IPs via REST API (device registry).
         Similar to sonos_player.py's REST fallback.
         """
-        import re
-        import httpx
-
         try:
             url = f"{self.media_controller.api_url}/config/device_registry/list"
             logger.info(f"  Cast: REST API fallback: {url}")
 
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(url, headers=self.media_controller.headers)
-                if response.status_code != 200:
-                    logger.warning(f"  Cast: REST API returned {response.status_code}")
-                    return {}
+            response = await self.media_controller.http.get(
+                url, headers=self.media_controller.headers, timeout=10.0
+            )
+            if response.status_code != 200:
+                logger.warning(f"  Cast: REST API returned {response.status_code}")
+                return {}
 
-                devices = response.json()
-                cast_ips = {}
+            return _extract_cast_ips(response.json())
 
-                for device in devices:
-                    identifiers = device.get('identifiers', [])
-                    manufacturer = (device.get('manufacturer') or '').lower()
-                    name = device.get('name', '').lower()
+        except Exception as e:
+            logger.warning(f"  Cast: REST API fallback failed: {e}")
+            return {}
 
-                    # Broader Cast detection
-                    is_cast = (
-                        any('cast' in str(ident).lower() for ident in identifiers) or
-                        manufacturer in CAST_MANUFACTURERS or
-                        'nest' in name or
-                        'chromecast' in name or
-                        'google home' in name
-                    )
+    def _index_device_ips(self):
+        """Rebuild the name lookup index from _ha_device_ips."""
+        index: dict[str, str] = {}
+        tokens: dict[str, set[str]] = {}
+        for name, ip in self._ha_device_ips.items():
+            key = _normalize_device_name(name)
+            if not key:
+                continue
+            index.setdefault(key, ip)
+            index.setdefault(key.replace('_', ''), ip)
+            for token in key.split('_'):
+                tokens.setdefault(token, set()).add(key)
+        self._ha_device_index = index
+        self._ha_device_tokens = tokens
+
+    def _match_device_ip(self, names: list[str]) -> Optional[tuple[str, str]]:
+        """
+        Find the registry device matching any of the given names.
 
-                    if not is_cast:
-                        continue
+        Tries exact normalized names first, then falls back to devices whose
+        name tokens are a subset or superset of a candidate's tokens.
+
+        Returns:
+            (device_name, ip) tuple, or None if nothing matches
+        """
+        keys = [key for key in dict.fromkeys(map(_normalize_device_name, names)) if key]
+
+        for key in keys:
+            ip = self._ha_device_index.get(key) or self._ha_device_index.get(key.replace('_', ''))
+            if ip:
+                return key, ip
+
+        best = None
+        best_overlap = 0
+        for key in keys:
+            wanted = set(key.split('_'))
+            candidates = set()
+            for token in wanted:
+                candidates.update(self._ha_device_tokens.get(token, ()))
+            for device_name in candidates:
+                have = set(device_name.split('_'))
+                if not (wanted <= have or have <= wanted):
+                    continue
+                overlap = len(wanted & have)
+                if overlap > best_overlap:
+                    best, best_overlap = device_name, overlap
+            if best:
+                return best, self._ha_device_index[best]
 
-                    name_normalized = name.replace(' ', '_')
-
-                    # Try configuration_url
-                    config_url = device.get('configuration_url', '')
-                    if config_url:
-                        ip_match = re.search(r'://(\d+\.\d+\.\d+\.\d+)', config_url)
-                        if ip_match:
-                            ip = ip_match.group(1)
-                            cast_ips[name] = ip
-                            cast_ips[name_normalized] = ip
-                            logger.info(f"  Cast: REST found '{name}' at {ip}")
-                            continue
-
-                    # Try connections field
-                    connections = device.get('connections', [])
-                    for conn in connections:
-                        if isinstance(conn, (list, tuple)) and len(conn) >= 2:
-                            if conn[0] == 'ip':
-                                cast_ips[name] = conn[1]
-                                cast_ips[name_normalized] = conn[1]
-                                logger.info(f"  Cast: REST found '{name}' at {conn[1]}")
-                                break
+        return None
 
-                return cast_ips
+    def _is_cast_by_state(self, entity_id: str, state: Optional[dict]) -> bool:
+        """Check entity state attributes and friendly_name for Cast indicators."""
+        if not state:
+            return False
 
-        except Exception as e:
-            logger.warning(f"  Cast: REST API fallback failed: {e}")
-            return {}
+        attributes = state.get('attributes', {})
+
+        # Check for Cast-specific attributes
+        if _is_cast_by_attributes(attributes):
+            logger.debug(f"  Cast: {entity_id} detected by attributes")
+            return True
+
+        # Check friendly_name for patterns
+        friendly_name = attributes.get('friendly_name', '').lower()
+        if _CAST_NAME_RE.search(friendly_name):
+            logger.debug(f"  Cast: {entity_id} detected by friendly_name")
+            return True
+
+        return False
+
+    def _is_cast_by_registry(self, entity_id: str) -> bool:
+        """Check if entity name matches any Cast device in the loaded HA registry."""
+        match = self._match_device_ip([entity_id.rpartition('.')[2]])
+        if match:
+            logger.debug(f"  Cast: {entity_id} detected by HA registry match ('{match[0]}')")
+            return True
+        return False
 
     async def is_cast(self, entity_id: str) -> bool:
         """
@@ -323,8 +578,8 @@ class CastPlayer:
 
         Uses multiple detection methods:
         1. Entity ID pattern matching
-        2. HA device registry (manufacturer, identifiers)
-        3. Entity attributes
+        2. Entity attributes
+        3. HA device registry (manufacturer, identifiers)
 
         Results are cached for performance.
         """
@@ -332,6 +587,10 @@ class CastPlayer:
         if entity_id in self._cast_cache:
             return self._cast_cache[entity_id]
 
+        if not _is_media_player(entity_id):
+            self._cast_cache[entity_id] = False
+            return False
+
         # Quick check: entity ID patterns
         if _is_cast_by_entity_pattern(entity_id):
             self._cast_cache[entity_id] = True
@@ -340,36 +599,55 @@ class CastPlayer:
 
         # Check entity attributes
         state = await self.media_controller.get_state(entity_id)
-        if state:
-            attributes = state.get('attributes', {})
-
-            # Check for Cast-specific attributes
-            if _is_cast_by_attributes(attributes):
-                self._cast_cache[entity_id] = True
-                logger.debug(f"  Cast: {entity_id} detected by attributes")
-                return True
-
-            # Check friendly_name for patterns
-            friendly_name = attributes.get('friendly_name', '').lower()
-            if any(pattern.replace('_', ' ') in friendly_name for pattern in CAST_ENTITY_PATTERNS):
-                self._cast_cache[entity_id] = True
-                logger.debug(f"  Cast: {entity_id} detected by friendly_name")
-                return True
+        if self._is_cast_by_state(entity_id, state):
+            self._cast_cache[entity_id] = True
+            return True
 
         # Load HA device IPs if not done
         await self._load_ha_device_ips()
 
-        # Check if entity name matches any Cast device in registry
-        entity_name = entity_id.split('.')[-1].lower() if '.' in entity_id else entity_id.lower()
-        for device_name in self._ha_device_ips.keys():
-            if entity_name in device_name or device_name in entity_name:
-                self._cast_cache[entity_id] = True
-                logger.debug(f"  Cast: {entity_id} detected by HA registry match")
-                return True
+        result = self._is_cast_by_registry(entity_id)
+        self._cast_cache[entity_id] = result
+        return result
 
-        # Not a Cast device
-        self._cast_cache[entity_id] = False
-        return False
+    async def filter_cast(self, entity_ids: list[str]) -> list[str]:
+        """
+        Return the Cast devices among entity_ids, in order.
+
+        Same detection as is_cast, but entities not already cached are
+        classified together: one bulk state fetch and at most one registry
+        load, instead of a round trip per entity.
+        """
+        unknown = [eid for eid in dict.fromkeys(entity_ids) if eid not in self._cast_cache]
+
+        need_state = []
+        for eid in unknown:
+            if not _is_media_player(eid):
+                self._cast_cache[eid] = False
+            elif _is_cast_by_entity_pattern(eid):
+                self._cast_cache[eid] = True
+                logger.debug(f"  Cast: {eid} detected by entity pattern")
+            else:
+                need_state.append(eid)
+
+        if need_state:
+            states = await self.media_controller.get_states_bulk(need_state)
+            need_registry = []
+            for eid in need_state:
+                if self._is_cast_by_state(eid, states.get(eid)):
+                    self._cast_cache[eid] = True
+                else:
+                    need_registry.append(eid)
+
+            if need_registry:
+                await self._load_ha_device_ips()
+                for eid in need_registry:
+                    self._cast_cache[eid] = self._is_cast_by_registry(eid)
+
+        if unknown:
+            await self._save_cache()
+
+        return [eid for eid in entity_ids if self._cast_cache.get(eid)]
 
     async def get_cast_ip(self, entity_id: str) -> Optional[str]:
         """
@@ -417,33 +695,17 @@ class CastPlayer:
         # Load HA device IPs
         await self._load_ha_device_ips()
 
-        # Try to match by name
-        names_to_try = []
-
-        # Extract entity name from entity_id
-        entity_name = entity_id.split('.')[-1].lower() if '.' in entity_id else entity_id.lower()
-        names_to_try.append(entity_name)
-        names_to_try.append(entity_name.replace('_', ' '))
-
-        # Add friendly name
-        if friendly_name:
-            names_to_try.append(friendly_name.lower())
-            names_to_try.append(friendly_name.lower().replace(' ', '_'))
+        # Try to match by entity name, then friendly name.
+        # _match_device_ip normalizes case and separators itself.
+        entity_name = entity_id.rpartition('.')[2].lower()
 
         # Search in HA device IPs
-        for name in names_to_try:
-            if name in self._ha_device_ips:
-                ip = self._ha_device_ips[name]
-                self._ip_cache[entity_id] = ip
-                logger.info(f"  Cast: Found IP {ip} for '{name}' from HA registry")
-                return ip
-
-            # Partial match
-            for device_name, ip in self._ha_device_ips.items():
-                if name in device_name or device_name in name:
-                    self._ip_cache[entity_id] = ip
-                    logger.info(f"  Cast: Partial match '{name}' -> '{device_name}' at {ip}")
-                    return ip
+        match = self._match_device_ip([entity_name, friendly_name or ''])
+        if match:
+            device_name, ip = match
+            self._ip_cache[entity_id] = ip
+            logger.info(f"  Cast: Matched '{device_name}' at {ip} from HA registry")
+            return ip
 
         # Final fallback: mDNS discovery
         logger.info(f"  Cast: Trying mDNS discovery for {entity_id}...")
@@ -476,9 +738,55 @@ class CastPlayer:
         Returns:
             IP address string, or None if not found
         """
+        discovered = await self._mdns_discover()
+        if not discovered:
+            return None
+
+        # Build search names
+        search_names = []
+        if friendly_name:
+            search_names.append(friendly_name.lower())
+        if entity_name:
+            search_names.append(entity_name.lower().replace('_', ' '))
+            search_names.append(entity_name.lower())
+
+        logger.debug(f"  Cast: mDNS knows {len(discovered)} device(s), searching for: {search_names}")
+
+        # Check if any discovered device matches our target
+        for device_name, device_ip in discovered:
+            for search_name in search_names:
+                if search_name in device_name or device_name in search_name:
+                    logger.info(f"  Cast: mDNS found '{device_name}' at {device_ip}")
+                    return device_ip
+
+        logger.debug(f"  Cast: mDNS did not find matching device")
+        return None
+
+    async def _mdns_discover(self) -> list[tuple[str, str]]:
+        """
+        Return (lowercase friendly name, IP) pairs for Cast devices found via mDNS.
+
+        Results are reused for MDNS_DISCOVERY_TTL, and concurrent callers share
+        a single in-flight scan rather than each running their own.
+        """
+        if time.monotonic() < self._mdns_expiry:
+            return self._mdns_results
+
+        task = self._mdns_task
+        if task is None:
+            task = self._mdns_task = asyncio.ensure_future(self._run_mdns_discovery())
+            # Cleared when the scan finishes, even if every waiter was cancelled
+            task.add_done_callback(self._clear_mdns_task)
+        return await asyncio.shield(task)
+
+    def _clear_mdns_task(self, task: asyncio.Future):
+        if self._mdns_task is task:
+            self._mdns_task = None
+
+    async def _run_mdns_discovery(self) -> list[tuple[str, str]]:
+        """Run one mDNS scan and merge the results into the device IP cache."""
         try:
             import pychromecast
-            from concurrent.futures import ThreadPoolExecutor
 
             def discover_sync():
                 """Run blocking discovery in thread."""
@@ -491,57 +799,42 @@ class CastPlayer:
                     logger.debug(f"  Cast: mDNS discovery error: {e}")
                     return []
 
-            # Run in thread pool since pychromecast is blocking
-            loop = asyncio.get_event_loop()
-            with ThreadPoolExecutor(max_workers=1) as pool:
-                services = await loop.run_in_executor(pool, discover_sync)
-
-            if not services:
-                logger.debug("  Cast: mDNS discovered no devices")
-                return None
+            # Run in a worker thread since pychromecast is blocking
+            services = await asyncio.to_thread(discover_sync)
 
-            # Build search names
-            search_names = []
-            if friendly_name:
-                search_names.append(friendly_name.lower())
-            if entity_name:
-                search_names.append(entity_name.lower().replace('_', ' '))
-                search_names.append(entity_name.lower())
-
-            logger.debug(f"  Cast: mDNS found {len(services)} device(s), searching for: {search_names}")
-
-            # Search through discovered devices
-            for service in services:
-                try:
-                    device_name = (service.friendly_name or '').lower()
-                    device_ip = service.host
+        except ImportError:
+            logger.debug("  Cast: pychromecast not available for mDNS discovery")
+            services = []
+        except Exception as e:
+            logger.warning(f"  Cast: mDNS discovery failed: {e}")
+            services = []
 
-                    if not device_ip:
-                        continue
+        # Cache all discovered Cast devices for future use
+        discovered = []
+        for service in services:
+            try:
+                device_name = (service.friendly_name or '').lower()
+                device_ip = service.host
 
-                    # Cache all discovered Cast devices for future use
-                    self._ha_device_ips[device_name] = device_ip
-                    self._ha_device_ips[device_name.replace(' ', '_')] = device_ip
+                if not device_ip:
+                    continue
 
-                    # Check if this matches our target
-                    for search_name in search_names:
-                        if search_name in device_name or device_name in search_name:
-                            logger.info(f"  Cast: mDNS found '{device_name}' at {device_ip}")
-                            return device_ip
+                self._ha_device_ips[device_name] = device_ip
+                self._ha_device_ips[device_name.replace(' ', '_')] = device_ip
+                discovered.append((device_name, device_ip))
 
-                except Exception as e:
-                    logger.debug(f"  Cast: Error processing mDNS service: {e}")
-                    continue
+            except Exception as e:
+                logger.debug(f"  Cast: Error processing mDNS service: {e}")
+                continue
 
-            logger.debug(f"  Cast: mDNS did not find matching device")
-            return None
+        if discovered:
+            self._index_device_ips()
+        else:
+            logger.debug("  Cast: mDNS discovered no devices")
 
-        except ImportError:
-            logger.debug("  Cast: pychromecast not available for mDNS discovery")
-            return None
-        except Exception as e:
-            logger.warning(f"  Cast: mDNS discovery failed: {e}")
-            return None
+        self._mdns_results = discovered
+        self._mdns_expiry = time.monotonic() + MDNS_DISCOVERY_TTL
+        return discovered
 
     def _create_cast_connection(self, ip: str, port: int = 8009):
         """Create a pychromecast connection to a Cast device."""
@@ -563,44 +856,78 @@ class CastPlayer:
 
             cast = Chromecast(cast_info=cast_info)
             cast.wait(timeout=10)
+            if not cast.socket_client.is_connected:
+                logger.error(f"  Cast: Timed out connecting to {ip}")
+                self._disconnect_sync(cast)
+                return None
             return cast
         except Exception as e:
             logger.error(f"  Cast: Failed to connect to {ip}: {e}")
             return None
 
-    def _play_media_sync(self, ip: str, url: str, content_type: str = "audio/mpeg") -> bool:
+    @staticmethod
+    def _disconnect_sync(cast):
+        """Stop a connection's socket thread without waiting for it (blocking call)."""
+        try:
+            cast.disconnect(timeout=0)
+        except Exception as e:
+            logger.warning(f"  Cast: Error disconnecting from {cast.cast_info.host}: {e}")
+
+    def _get_connection_sync(self, entity_id: str, ip: str, listener: _PlaybackWaiter):
+        """
+        Return the open connection for an entity, connecting if needed (blocking).
+
+        Connections are kept across plays so the TLS and receiver handshake is
+        only paid once per device.
+        """
+        cast = self._connections.get(entity_id)
+        if cast is not None:
+            if cast.socket_client.is_connected and cast.cast_info.host == ip:
+                return cast
+            self._connections.pop(entity_id, None)
+            self._disconnect_sync(cast)
+
+        cast = self._create_cast_connection(ip)
+        if not cast:
+            return None
+
+        cast.media_controller.register_status_listener(listener)
+        self._connections[entity_id] = cast
+        return cast
+
+    def _start_media_sync(
+        self,
+        entity_id: str,
+        ip: str,
+        url: str,
+        listener: _PlaybackWaiter,
+        content_type: str = "audio/mpeg",
+    ) -> bool:
         """
-        Play media URL on Cast device (blocking, runs in thread).
+        Issue the play request on a Cast device (blocking, runs in thread).
+
+        Playback state is reported to ``listener`` by pychromecast, so the
+        worker thread is released as soon as the request has been sent.
 
         Args:
+            entity_id: HA entity ID (connection cache key)
             ip: Cast device IP address
             url: Media URL to play
+            listener: Status listener notified when playback starts or fails
             content_type: MIME type (default: audio/mpeg)
 
         Returns:
-            True if playback started successfully
+            True if the play request was sent
         """
         try:
-            cast = self._create_cast_connection(ip)
+            cast = self._get_connection_sync(entity_id, ip, listener)
             if not cast:
                 return False
 
-            mc = cast.media_controller
-            mc.play_media(url, content_type)
-
-            # Wait for playback to start
-            import time
-            for _ in range(10):
-                time.sleep(0.5)
-                if mc.status.player_state in ('PLAYING', 'BUFFERING'):
-                    logger.info(f"  Cast: Started playback on {ip} (state: {mc.status.player_state})")
-                    return True
-                if mc.status.idle_reason:
-                    logger.warning(f"  Cast: Playback failed on {ip}: {mc.status.idle_reason}")
-                    return False
-
-            logger.warning(f"  Cast: Timeout waiting for playback on {ip}")
-            return False
+            # Status updates for the session being replaced must not resolve this request
+            listener.stale_session_id = cast.media_controller.status.media_session_id
+            cast.media_controller.play_media(url, content_type)
+            return True
 
         except Exception as e:
             logger.error(f"  Cast: Failed to play on {ip}: {e}")
@@ -608,6 +935,21 @@ class CastPlayer:
             logger.debug(traceback.format_exc())
             return False
 
+    async def _wait_for_playback(self, ip: str, listener: _PlaybackWaiter, timeout: float = 5.0) -> bool:
+        """Wait for the device to report PLAYING/BUFFERING or an idle reason."""
+        try:
+            await asyncio.wait_for(listener.event.wait(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"  Cast: Timeout waiting for playback on {ip}")
+            return False
+
+        if listener.player_state:
+            logger.info(f"  Cast: Started playback on {ip} (state: {listener.player_state})")
+            return True
+
+        logger.warning(f"  Cast: Playback failed on {ip}: {listener.idle_reason}")
+        return False
+
     async def _play_via_ha_api(self, entity_id: str, media_url: str) -> bool:
         """
         Play media using HA's media_player.play_media service.
@@ -623,8 +965,6 @@ class CastPlayer:
             True if the service call succeeded
         """
         try:
-            import httpx
-
             url = f"{self.media_controller.api_url}/services/media_player/play_media"
             data = {
                 "entity_id": entity_id,
@@ -636,19 +976,19 @@ class CastPlayer:
             logger.debug(f"  Cast: POST {url}")
             logger.debug(f"  Cast: Data: {data}")
 
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    url,
-                    json=data,
-                    headers=self.media_controller.headers,
-                )
+            response = await self.media_controller.http.post(
+                url,
+                json=data,
+                headers=self.media_controller.headers,
+                timeout=30.0,
+            )
 
-                if response.status_code == 200:
-                    logger.info(f"  Cast: HA API play_media succeeded for {entity_id}")
-                    return True
-                else:
-                    logger.warning(f"  Cast: HA API returned {response.status_code}: {response.text}")
-                    return False
+            if response.status_code == 200:
+                logger.info(f"  Cast: HA API play_media succeeded for {entity_id}")
+                return True
+            else:
+                logger.warning(f"  Cast: HA API returned {response.status_code}: {response.text}")
+                return False
 
         except Exception as e:
             logger.error(f"  Cast: HA API fallback failed for {entity_id}: {e}")
@@ -673,6 +1013,20 @@ class CastPlayer:
             return False
 
         ip = await self.get_cast_ip(entity_id)
+        return await self._play_media_noverify(entity_id, media_url, ip)
+
+    async def _play_media_noverify(self, entity_id: str, media_url: str, ip: Optional[str]) -> bool:
+        """
+        Play media on an entity already known to be a Cast device.
+
+        Args:
+            entity_id: HA entity ID
+            media_url: Stream URL to play
+            ip: Resolved device IP, or None to use the HA API fallback
+
+        Returns:
+            True if playback started successfully
+        """
         if not ip:
             # Fall back to HA API - HA's Cast integration knows how to reach the device
             logger.info(f"  Cast: No IP found for {entity_id}, using HA API fallback")
@@ -680,8 +1034,22 @@ class CastPlayer:
 
         logger.info(f"  Cast: Playing {media_url} on {entity_id} ({ip})")
 
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(_executor, self._play_media_sync, ip, media_url)
+        lock = self._play_locks.get(entity_id)
+        if lock is None:
+            lock = self._play_locks[entity_id] = asyncio.Lock()
+
+        async with lock:
+            listener = self._listeners.get(entity_id)
+            if listener is None:
+                listener = self._listeners[entity_id] = _PlaybackWaiter(asyncio.get_running_loop())
+            listener.reset(media_url)
+            async with self._play_sem:
+                started = await asyncio.to_thread(self._start_media_sync, entity_id, ip, media_url, listener)
+            if not started:
+                # Re-resolve next time in case the device moved
+                self._ip_cache.pop(entity_id, None)
+                return False
+            return await self._wait_for_playback(ip, listener)
 
     async def play_media_multi(
         self,
@@ -702,9 +1070,8 @@ class CastPlayer:
             return {}
 
         # Filter to only Cast devices
-        cast_checks = await asyncio.gather(*[self.is_cast(eid) for eid in entity_ids])
-        cast_ids = [eid for eid, is_cast in zip(entity_ids, cast_checks) if is_cast]
-        non_cast_ids = [eid for eid, is_cast in zip(entity_ids, cast_checks) if not is_cast]
+        cast_ids = await self.filter_cast(entity_ids)
+        non_cast_ids = [eid for eid in entity_ids if eid not in cast_ids]
 
         if non_cast_ids:
             logger.debug(f"  Cast: Skipping non-Cast devices: {non_cast_ids}")
@@ -712,12 +1079,23 @@ class CastPlayer:
         if not cast_ids:
             return {}
 
+        # Resolve all IPs concurrently, then play without re-checking each entity
+        ips = await asyncio.gather(*[self.get_cast_ip(eid) for eid in cast_ids], return_exceptions=True)
+
+        status = {}
+        targets = []
+        for entity_id, ip in zip(cast_ids, ips):
+            if isinstance(ip, Exception):
+                logger.error(f"  Cast: Exception resolving IP for {entity_id}: {ip}")
+                status[entity_id] = False
+            else:
+                targets.append((entity_id, ip))
+
         # Play on all Cast devices concurrently
-        tasks = [self.play_media(eid, media_url) for eid in cast_ids]
+        tasks = [self._play_media_noverify(eid, media_url, ip) for eid, ip in targets]
         results = await asyncio.gather(*tasks, return_exceptions=True)
 
-        status = {}
-        for entity_id, result in zip(cast_ids, results):
+        for (entity_id, _), result in zip(targets, results):
             if isinstance(result, Exception):
                 logger.error(f"  Cast: Exception for {entity_id}: {result}")
                 status[entity_id] = False
@@ -734,5 +1112,30 @@ class CastPlayer:
         self._ip_cache.clear()
         self._cast_cache.clear()
         self._ha_device_ips.clear()
-        self._ha_ips_loaded = False
+        self._ha_device_index.clear()
+        self._ha_device_tokens.clear()
+        self._ha_ips_expiry = 0.0
+        self._mdns_results = []
+        self._mdns_expiry = 0.0
+        try:
+            CAST_CACHE_PATH.unlink(missing_ok=True)
+        except OSError:
+            pass
         logger.info("  Cast: Cleared all caches")
+
+    async def close(self):
+        """Disconnect all persistent Cast connections."""
+        connections = list(self._connections.values())
+        self._connections.clear()
+        self._listeners.clear()
+
+        def disconnect_all():
+            for cast in connections:
+                try:
+                    cast.disconnect(timeout=2)
+                except Exception as e:
+                    logger.debug(f"  Cast: Error disconnecting: {e}")
+
+        if connections:
+            await asyncio.to_thread(disconnect_all)
+            logger.info(f"  Cast: Closed {len(connections)} connection(s)")
@@ -26,6 +26,9 @@ if TYPE_CHECKING:
 # Short timeout - we just want to fire the request, not wait for completion
 REQUEST_TIMEOUT = 5.0
 
+# Keep-alive connections held open to the HA API by the shared client
+MAX_KEEPALIVE_CONNECTIONS = 8
+
 
 class HAMediaController:
     """
@@ -58,6 +61,11 @@ class HAMediaController:
             "Authorization": f"Bearer {token}",
             "Content-Type": "application/json",
         }
+        # Shared client so HA API calls (including Sonos/Cast fallbacks) reuse connections
+        self.http = httpx.AsyncClient(
+            timeout=REQUEST_TIMEOUT,
+            limits=httpx.Limits(max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS),
+        )
 
         # Initialize SonosPlayer for direct Sonos control
         self._sonos_player: Optional[SonosPlayer] = None
@@ -104,12 +112,11 @@ class HAMediaController:
         logger.debug(f"    Data: {data}")
         
         try:
-            async with httpx.AsyncClient(timeout=REQUEST_TIMEOUT) as client:
-                response = await client.post(url, headers=self.headers, json=data)
-                logger.debug(f"    Response: {response.status_code}")
-                if response.status_code not in (200, 201):
-                    logger.error(f"    HA API error {response.status_code}: {response.text[:500]}")
-                return response.status_code in (200, 201)
+            response = await self.http.post(url, headers=self.headers, json=data)
+            logger.debug(f"    Response: {response.status_code}")
+            if response.status_code not in (200, 201):
+                logger.error(f"    HA API error {response.status_code}: {response.text[:500]}")
+            return response.status_code in (200, 201)
         except httpx.TimeoutException:
             # Timeout is OK - request was sent, speaker might just be slow
             logger.debug(f"    Request sent (timed out waiting for response)")
@@ -215,14 +222,8 @@ class HAMediaController:
 
         # Check for Cast devices among the "other" speakers
         if self._cast_player and self._use_pychromecast_for_cast and other_ids:
-            remaining_ids = []
-            # is_cast is async, so we need to check each one
-            for eid in other_ids:
-                if await self._cast_player.is_cast(eid):
-                    cast_ids.append(eid)
-                else:
-                    remaining_ids.append(eid)
-            other_ids = remaining_ids
+            cast_ids = await self._cast_player.filter_cast(other_ids)
+            other_ids = [eid for eid in other_ids if eid not in cast_ids]
 
         # Play on Sonos speakers using SoCo (if any)
         if sonos_ids:
@@ -345,14 +346,41 @@ class HAMediaController:
         """
         url = f"{self.api_url}/states/{entity_id}"
         try:
-            async with httpx.AsyncClient(timeout=REQUEST_TIMEOUT) as client:
-                response = await client.get(url, headers=self.headers)
-                if response.status_code == 200:
-                    return response.json()
+            response = await self.http.get(url, headers=self.headers)
+            if response.status_code == 200:
+                return response.json()
         except Exception as e:
             logger.error(f"Failed to get state for {entity_id}: {e}")
         return None
     
+    async def get_states_bulk(self, entity_ids: list[str]) -> dict[str, dict]:
+        """
+        Get current state of several entities.
+
+        Uses a single GET /api/states for more than one entity rather than
+        one request each.
+
+        Returns:
+            Dict mapping entity_id to state dict, for entities that were found
+        """
+        if len(entity_ids) == 1:
+            state = await self.get_state(entity_ids[0])
+            return {entity_ids[0]: state} if state else {}
+
+        wanted = set(entity_ids)
+        url = f"{self.api_url}/states"
+        try:
+            response = await self.http.get(url, headers=self.headers)
+            if response.status_code == 200:
+                return {
+                    state["entity_id"]: state
+                    for state in response.json()
+                    if state.get("entity_id") in wanted
+                }
+        except Exception as e:
+            logger.error(f"Failed to get states for {len(wanted)} entities: {e}")
+        return {}
+
     async def is_playing(self, entity_id: str) -> bool:
         """Check if a media player is currently playing."""
         state = await self.get_state(entity_id)
@@ -371,6 +399,17 @@ class HAMediaController:
             for eid, r in zip(entity_ids, results)
         }
 
+    async def prewarm(self):
+        """Load speaker lookup data in the background so the first play doesn't wait for it."""
+        if self._sonos_player and self._use_soco_for_sonos:
+            await self._sonos_player.prewarm()
+
+    async def close(self):
+        """Close Cast connections and the shared HTTP client."""
+        if self._cast_player:
+            await self._cast_player.close()
+        await self.http.aclose()
+
 
 # Factory function
 def create_media_controller_from_supervisor() -> HAMediaController:
@@ -12,6 +12,7 @@ Creates and manages Home Assistant entities via MQTT Discovery:
 
 from __future__ import annotations
 
+import asyncio
 import json
 from typing import TYPE_CHECKING, Callable, Awaitable
 from dataclasses import dataclass
@@ -22,6 +23,10 @@ if TYPE_CHECKING:
     from sonorium.core.state import Session, StateStore
     from sonorium.core.session_manager import SessionManager
 
+# Delay before refreshing global control states after a command, so a burst
+# of commands results in a single refresh
+GLOBAL_UPDATE_COOLDOWN = 0.3
+
 
 @dataclass
 class EntityConfig:
@@ -70,13 +75,20 @@ class SessionMQTTEntities:
         self.base_topic = f"homeassistant"
         self.state_topic_base = f"{entity_prefix}/{self.slug}"
 
-        # Theme name/ID mappings (populated in _publish_theme_select)
-        self._theme_name_to_id: dict[str, str] = {}
-        self._theme_id_to_name: dict[str, str] = {}
+        # Theme name/ID mappings (rebuilt in _publish_theme_select)
+        self._theme_id_to_name: dict[str, str] = {
+            t["id"]: t["name"] for t in self.themes if t.get("id") and t.get("name")
+        }
+        self._theme_name_to_id: dict[str, str] = {
+            theme_name: theme_id for theme_id, theme_name in self._theme_id_to_name.items()
+        }
 
         # Preset name/ID mappings (populated in _publish_preset_select)
         self._preset_name_to_id: dict[str, str] = {}
         self._preset_id_to_name: dict[str, str] = {}
+
+        # Last payload published per state topic, to skip unchanged writes
+        self._last_state: dict[str, str] = {}
     
     def _get_unique_id(self, suffix: str) -> str:
         """Generate unique ID for an entity."""
@@ -105,6 +117,9 @@ class SessionMQTTEntities:
         await asyncio.sleep(0.05)
         await self._publish_speakers_sensor()
 
+        # Fresh discovery: make the next update_state publish everything
+        self._last_state.clear()
+
         logger.info(f"Published MQTT discovery for session '{self.session.name}'")
     
     async def remove_discovery(self):
@@ -124,37 +139,29 @@ class SessionMQTTEntities:
 
         logger.info(f"Removed MQTT discovery for session '{self.session.name}'")
     
+    async def _publish_state(self, suffix: str, payload: str):
+        """Publish a retained entity state, skipping it if unchanged since the last publish."""
+        topic = f"{self.state_topic_base}/{suffix}/state"
+        if self._last_state.get(topic) == payload:
+            return
+        await self.mqtt_publish(topic, payload, retain=True)
+        self._last_state[topic] = payload
+
     async def update_state(self):
         """Publish current state for all entities."""
         # Play switch state
-        await self.mqtt_publish(
-            f"{self.state_topic_base}/play/state",
-            "ON" if self.session.is_playing else "OFF",
-            retain=True,
-        )
+        await self._publish_state("play", "ON" if self.session.is_playing else "OFF")
 
         # Theme select state (use name, not ID)
         theme_name = self._theme_id_to_name.get(self.session.theme_id, "") if self.session.theme_id else ""
-        await self.mqtt_publish(
-            f"{self.state_topic_base}/theme/state",
-            theme_name,
-            retain=True,
-        )
+        await self._publish_state("theme", theme_name)
 
         # Preset select state (use name, not ID)
         preset_name = self._preset_id_to_name.get(self.session.preset_id, "") if self.session.preset_id else ""
-        await self.mqtt_publish(
-            f"{self.state_topic_base}/preset/state",
-            preset_name,
-            retain=True,
-        )
+        await self._publish_state("preset", preset_name)
 
         # Volume number state
-        await self.mqtt_publish(
-            f"{self.state_topic_base}/volume/state",
-            str(self.session.volume),
-            retain=True,
-        )
+        await self._publish_state("volume", str(self.session.volume))
 
         # Status sensor
         if self.session.is_playing and self.session.theme_id:
@@ -162,18 +169,11 @@ class SessionMQTTEntities:
             status = f"Playing: {theme_name}"
         else:
             status = "Stopped"
-        await self.mqtt_publish(
-            f"{self.state_topic_base}/status/state",
-            status,
-            retain=True,
-        )
+        await self._publish_state("status", status)
     
     def _get_theme_name(self, theme_id: str) -> str:
         """Get theme name from ID."""
-        for theme in self.themes:
-            if theme.get("id") == theme_id:
-                return theme.get("name", theme_id)
-        return theme_id
+        return self._theme_id_to_name.get(theme_id, theme_id)
     
     async def _publish_play_switch(self):
         """Publish play/pause switch discovery."""
@@ -312,11 +312,7 @@ class SessionMQTTEntities:
     
     async def update_speakers_sensor(self, speaker_summary: str):
         """Update the speakers sensor with current selection."""
-        await self.mqtt_publish(
-            f"{self.state_topic_base}/speakers/state",
-            speaker_summary,
-            retain=True,
-        )
+        await self._publish_state("speakers", speaker_summary)
 
 
 class SonoriumMQTTManager:
@@ -364,7 +360,7 @@ class SonoriumMQTTManager:
         # Session name to ID mapping for global controls
         self._session_name_to_id: dict[str, str] = {}
 
-        # Theme name/ID mappings for global controls (populated in _publish_global_entities)
+        # Theme name/ID mappings for global controls (built in set_themes, refreshed in _publish_global_entities)
         self._theme_name_to_id: dict[str, str] = {}
         self._theme_id_to_name: dict[str, str] = {}
 
@@ -383,9 +379,20 @@ class SonoriumMQTTManager:
         # Themes cache
         self._themes: list[dict] = []
 
+        # Pending debounced global control refresh
+        self._global_update_task: asyncio.Task | None = None
+        # Set by stop(), so no refresh is scheduled after teardown
+        self._stopped = False
+
     def set_themes(self, themes: list[dict]):
         """Update the available themes list."""
         self._themes = themes
+        self._theme_id_to_name = {
+            t["id"]: t["name"] for t in themes if t.get("id") and t.get("name")
+        }
+        self._theme_name_to_id = {
+            theme_name: theme_id for theme_id, theme_name in self._theme_id_to_name.items()
+        }
 
     def get_presets_for_theme(self, theme_id: str) -> list[dict]:
         """Get list of presets for a theme."""
@@ -498,6 +505,17 @@ class SonoriumMQTTManager:
         await self._subscribe_commands()
 
         logger.info(f"MQTT initialized with {len(self._session_entities)} sessions")
+
+    async def stop(self):
+        """Cancel pending refreshes so nothing is published after shutdown."""
+        self._stopped = True
+        task, self._global_update_task = self._global_update_task, None
+        if task:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
     
     async def add_session_entities(self, session: Session):
         """Add MQTT entities for a new session."""
@@ -906,12 +924,7 @@ class SonoriumMQTTManager:
             # Status
             status = "Playing" if session.is_playing else "Stopped"
             if session.theme_id:
-                # Try to get theme name
-                theme_name = session.theme_id
-                for theme in self._themes:
-                    if theme.get("id") == session.theme_id:
-                        theme_name = theme.get("name", session.theme_id)
-                        break
+                theme_name = self._theme_id_to_name.get(session.theme_id, session.theme_id)
                 status = f"{status} - {theme_name}"
             await self._mqtt_publish(
                 f"{self.prefix}/status/state",
@@ -939,6 +952,26 @@ class SonoriumMQTTManager:
             await self._mqtt_publish(f"{self.prefix}/speakers/state", "None", retain=True)
             await self._update_global_preset_options(None)
     
+    def _schedule_global_update(self):
+        """
+        Refresh global control states after a short cooldown.
+
+        Commands arriving within the cooldown share one refresh, which reads
+        session state when it runs and so reflects all of them.
+        """
+        if self._global_update_task is None and not self._stopped:
+            self._global_update_task = asyncio.create_task(self._debounced_global_update())
+
+    async def _debounced_global_update(self):
+        """Run a scheduled global control refresh."""
+        await asyncio.sleep(GLOBAL_UPDATE_COOLDOWN)
+        # Cleared before refreshing, so commands arriving meanwhile schedule another
+        self._global_update_task = None
+        try:
+            await self._update_global_control_states()
+        except Exception as e:
+            logger.error(f"Failed to update global control states: {e}")
+
     async def _update_global_preset_options(self, theme_id: str | None):
         """Update the global preset select options based on theme."""
         options = [""]  # Empty option
@@ -1047,7 +1080,7 @@ class SonoriumMQTTManager:
         if topic == f"{self.prefix}/stop_all/set" and payload == "ON":
             await self.session_manager.stop_all()
             await self._update_active_sessions_count()
-            await self._update_global_control_states()
+            self._schedule_global_update()
             return
         
         # Session selector
@@ -1070,7 +1103,7 @@ class SonoriumMQTTManager:
                 selected_name,
                 retain=True,
             )
-            await self._update_global_control_states()
+            self._schedule_global_update()
             return
         
         # Global play control (operates on selected session)
@@ -1088,7 +1121,7 @@ class SonoriumMQTTManager:
             if session:
                 await self.update_session_state(session)
             await self._update_active_sessions_count()
-            await self._update_global_control_states()
+            self._schedule_global_update()
             return
         
         # Global theme control
@@ -1110,7 +1143,7 @@ class SonoriumMQTTManager:
                 # Update preset options in session entity
                 if self._selected_session_id in self._session_entities:
                     await self._session_entities[self._selected_session_id].update_preset_options()
-            await self._update_global_control_states()
+            self._schedule_global_update()
             return
         
         # Global preset control
@@ -1129,7 +1162,7 @@ class SonoriumMQTTManager:
             session = self.state.sessions.get(self._selected_session_id)
             if session:
                 await self.update_session_state(session)
-            await self._update_global_control_states()
+            self._schedule_global_update()
             return
         
         # Global volume control
@@ -1144,7 +1177,7 @@ class SonoriumMQTTManager:
                 session = self.state.sessions.get(self._selected_session_id)
                 if session:
                     await self.update_session_state(session)
-                await self._update_global_control_states()
+                self._schedule_global_update()
             except ValueError:
                 logger.warning(f"Invalid volume value: {payload}")
             return
@@ -1165,7 +1198,7 @@ class SonoriumMQTTManager:
                 await self._update_active_sessions_count()
                 # Update global state if this is the selected session
                 if session_id == self._selected_session_id:
-                    await self._update_global_control_states()
+                    self._schedule_global_update()
                 return
             
             elif topic == f"{self.prefix}/{slug}/theme/set":
@@ -1183,7 +1216,7 @@ class SonoriumMQTTManager:
                     await entities.update_preset_options()
                 # Update global state if this is the selected session
                 if session_id == self._selected_session_id:
-                    await self._update_global_control_states()
+                    self._schedule_global_update()
                 return
 
             elif topic == f"{self.prefix}/{slug}/preset/set":
@@ -1199,7 +1232,7 @@ class SonoriumMQTTManager:
                     await self.update_session_state(session)
                 # Update global state if this is the selected session
                 if session_id == self._selected_session_id:
-                    await self._update_global_control_states()
+                    self._schedule_global_update()
                 return
 
             elif topic == f"{self.prefix}/{slug}/volume/set":
@@ -1211,7 +1244,7 @@ class SonoriumMQTTManager:
                         await self.update_session_state(session)
                     # Update global state if this is the selected session
                     if session_id == self._selected_session_id:
-                        await self._update_global_control_states()
+                        self._schedule_global_update()
                 except ValueError:
                     logger.warning(f"Invalid volume value: {payload}")
                 return
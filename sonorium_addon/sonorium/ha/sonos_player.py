@@ -17,11 +17,19 @@ from __future__ import annotations
 
 import asyncio
 import os
+import re
+import time
 from typing import Optional
 from concurrent.futures import ThreadPoolExecutor
 
 from sonorium.obs import logger
 
+# Dotted-quad IPv4 host in a URL such as a device's configuration_url
+_URL_IP_RE = re.compile(r'://(\d{1,3}(?:\.\d{1,3}){3})')
+
+# How long HA registry Sonos IPs are trusted before re-querying (seconds)
+HA_DEVICE_IPS_TTL = 600
+
 # SoCo is a blocking library, so we run it in a thread pool
 _executor = ThreadPoolExecutor(max_workers=4)
 
@@ -86,7 +94,6 @@ async def _get_sonos_ips_from_ha(media_controller) -> dict[str, str]:
     Returns dict mapping speaker name (lowercase) -> IP address
     """
     from sonorium.ha.registry import WEBSOCKETS_AVAILABLE
-    import re
 
     if not WEBSOCKETS_AVAILABLE:
         logger.warning("  SoCo: websockets not available for HA query, trying REST API fallback...")
@@ -151,7 +158,7 @@ async def _get_sonos_ips_from_ha(media_controller) -> dict[str, str]:
                 config_url = device.get('configuration_url', '')
                 if config_url:
                     # Extract IP from URL
-                    ip_match = re.search(r'://(\d+\.\d+\.\d+\.\d+)', config_url)
+                    ip_match = _URL_IP_RE.search(config_url)
                     if ip_match:
                         ip = ip_match.group(1)
                         sonos_ips[name] = ip
@@ -193,11 +200,7 @@ async def _get_sonos_ips_via_rest(media_controller) -> dict[str, str]:
 
     Returns dict mapping speaker name (lowercase) -> IP address
     """
-    import re
-
     try:
-        import httpx
-
         headers = {"Authorization": f"Bearer {media_controller.token}"}
         sonos_ips = {}
 
@@ -205,90 +208,90 @@ async def _get_sonos_ips_via_rest(media_controller) -> dict[str, str]:
         url = f"{media_controller.api_url}/config/device_registry/list"
         logger.info("  SoCo: Querying HA device registry via REST API...")
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(url, headers=headers)
+        client = media_controller.http
+        response = await client.get(url, headers=headers, timeout=30.0)
+
+        if response.status_code == 200:
+            devices = response.json()
+            logger.info(f"  SoCo: Got {len(devices)} devices from registry")
 
-            if response.status_code == 200:
-                devices = response.json()
-                logger.info(f"  SoCo: Got {len(devices)} devices from registry")
+            for device in devices:
+                # Check if it's a Sonos device
+                identifiers = device.get('identifiers', [])
+                is_sonos = any('sonos' in str(ident).lower() for ident in identifiers)
 
-                for device in devices:
-                    # Check if it's a Sonos device
-                    identifiers = device.get('identifiers', [])
-                    is_sonos = any('sonos' in str(ident).lower() for ident in identifiers)
+                if not is_sonos:
+                    continue
 
-                    if not is_sonos:
-                        continue
+                name = device.get('name', '').lower()
 
-                    name = device.get('name', '').lower()
-
-                    # Try configuration_url - often contains IP like http://192.168.1.x:1443/...
-                    config_url = device.get('configuration_url', '')
-                    if config_url:
-                        ip_match = re.search(r'://(\d+\.\d+\.\d+\.\d+)', config_url)
-                        if ip_match:
-                            ip = ip_match.group(1)
-                            sonos_ips[name] = ip
-                            logger.info(f"  SoCo: Found Sonos '{name}' at {ip} from device registry")
-                            continue
-
-                    # Try connections field
-                    connections = device.get('connections', [])
-                    for conn in connections:
-                        if isinstance(conn, (list, tuple)) and len(conn) >= 2:
-                            conn_type, conn_value = conn[0], conn[1]
-                            if conn_type == 'ip':
-                                sonos_ips[name] = conn_value
-                                logger.info(f"  SoCo: Found Sonos '{name}' at {conn_value} from connections")
-                                break
-
-                if sonos_ips:
-                    logger.info(f"  SoCo: Found {len(sonos_ips)} Sonos speaker(s) via REST device registry")
-                    return sonos_ips
+                # Try configuration_url - often contains IP like http://192.168.1.x:1443/...
+                config_url = device.get('configuration_url', '')
+                if config_url:
+                    ip_match = _URL_IP_RE.search(config_url)
+                    if ip_match:
+                        ip = ip_match.group(1)
+                        sonos_ips[name] = ip
+                        logger.info(f"  SoCo: Found Sonos '{name}' at {ip} from device registry")
+                        continue
 
-            else:
-                logger.warning(f"  SoCo: Device registry REST API returned {response.status_code}")
-
-            # Method 2: Query states and look for Sonos media_players
-            url = f"{media_controller.api_url}/states"
-            logger.info("  SoCo: Querying all states to find Sonos entities...")
-
-            response = await client.get(url, headers=headers)
-            if response.status_code == 200:
-                states = response.json()
-                sonos_entities = [
-                    s for s in states
-                    if s.get('entity_id', '').startswith('media_player.')
-                    and 'sonos' in s.get('entity_id', '').lower()
-                ]
-                logger.info(f"  SoCo: Found {len(sonos_entities)} Sonos entities in states")
-
-                for entity in sonos_entities:
-                    entity_id = entity.get('entity_id', '')
-                    attrs = entity.get('attributes', {})
-                    friendly_name = attrs.get('friendly_name', '')
-
-                    # Extract room name
-                    name = friendly_name.lower()
-                    if name.startswith('sonos '):
-                        name = name[6:]
-
-                    # Try common IP attributes
-                    for attr in ['ip_address', 'soco_ip', 'host', 'address']:
-                        if attr in attrs:
-                            ip = attrs[attr]
-                            sonos_ips[name] = ip
-                            logger.info(f"  SoCo: Found Sonos '{name}' at {ip} from entity attributes")
+                # Try connections field
+                connections = device.get('connections', [])
+                for conn in connections:
+                    if isinstance(conn, (list, tuple)) and len(conn) >= 2:
+                        conn_type, conn_value = conn[0], conn[1]
+                        if conn_type == 'ip':
+                            sonos_ips[name] = conn_value
+                            logger.info(f"  SoCo: Found Sonos '{name}' at {conn_value} from connections")
                             break
 
             if sonos_ips:
-                logger.info(f"  SoCo: Found {len(sonos_ips)} Sonos speaker(s) via REST API")
-            else:
-                logger.warning("  SoCo: No Sonos IPs found via REST API")
-                logger.info("  SoCo: To add manual IP mappings, set addon option:")
-                logger.info("  SoCo:   sonos_ips: \"bedroom=192.168.1.185,living_room=192.168.1.100\"")
+                logger.info(f"  SoCo: Found {len(sonos_ips)} Sonos speaker(s) via REST device registry")
+                return sonos_ips
 
-            return sonos_ips
+        else:
+            logger.warning(f"  SoCo: Device registry REST API returned {response.status_code}")
+
+        # Method 2: Query states and look for Sonos media_players
+        url = f"{media_controller.api_url}/states"
+        logger.info("  SoCo: Querying all states to find Sonos entities...")
+
+        response = await client.get(url, headers=headers, timeout=30.0)
+        if response.status_code == 200:
+            states = response.json()
+            sonos_entities = [
+                s for s in states
+                if s.get('entity_id', '').startswith('media_player.')
+                and 'sonos' in s.get('entity_id', '').lower()
+            ]
+            logger.info(f"  SoCo: Found {len(sonos_entities)} Sonos entities in states")
+
+            for entity in sonos_entities:
+                entity_id = entity.get('entity_id', '')
+                attrs = entity.get('attributes', {})
+                friendly_name = attrs.get('friendly_name', '')
+
+                # Extract room name
+                name = friendly_name.lower()
+                if name.startswith('sonos '):
+                    name = name[6:]
+
+                # Try common IP attributes
+                for attr in ['ip_address', 'soco_ip', 'host', 'address']:
+                    if attr in attrs:
+                        ip = attrs[attr]
+                        sonos_ips[name] = ip
+                        logger.info(f"  SoCo: Found Sonos '{name}' at {ip} from entity attributes")
+                        break
+
+        if sonos_ips:
+            logger.info(f"  SoCo: Found {len(sonos_ips)} Sonos speaker(s) via REST API")
+        else:
+            logger.warning("  SoCo: No Sonos IPs found via REST API")
+            logger.info("  SoCo: To add manual IP mappings, set addon option:")
+            logger.info("  SoCo:   sonos_ips: \"bedroom=192.168.1.185,living_room=192.168.1.100\"")
+
+        return sonos_ips
 
     except Exception as e:
         logger.error(f"  SoCo: REST API query failed: {e}")
@@ -399,7 +402,7 @@ async def play_uri_on_sonos(ip: str, uri: str) -> bool:
     Returns:
         True if playback started successfully
     """
-    loop = asyncio.get_event_loop()
+    loop = asyncio.get_running_loop()
     return await loop.run_in_executor(_executor, _play_uri_sync, ip, uri)
 
 
@@ -428,12 +431,15 @@ class SonosPlayer:
         self._ip_cache: dict[str, str] = {}
         # Cache of device name -> IP from HA registry
         self._ha_device_ips: dict[str, str] = {}
-        self._ha_ips_loaded = False
+        self._ha_ips_expiry = 0.0
+        # Serializes registry refreshes so concurrent plays share one query
+        self._ha_ips_lock = asyncio.Lock()
         # Cache of entity_id -> platform (e.g., 'sonos', 'cast', 'dlna')
         self._entity_platforms: dict[str, str] = {}
         # Cache of entity_id -> manufacturer
         self._entity_manufacturers: dict[str, str] = {}
         self._registry_loaded = False
+        self._registry_lock = asyncio.Lock()
 
     async def _load_entity_registry(self):
         """
@@ -442,11 +448,22 @@ class SonosPlayer:
         This enables reliable speaker type detection by checking:
         1. Entity registry 'platform' field (e.g., 'sonos', 'cast')
         2. Device registry 'manufacturer' field (e.g., 'Sonos', 'Google Inc.')
+
+        Callers arriving while the load is in progress (e.g. during prewarm)
+        wait for it rather than classifying speakers without registry data.
         """
         if self._registry_loaded:
             return
 
-        self._registry_loaded = True
+        async with self._registry_lock:
+            if not self._registry_loaded:
+                await self._query_entity_registry()
+                # Set only once the query has finished, failed or not, so callers
+                # wait for it above and a permanent failure isn't retried every call
+                self._registry_loaded = True
+
+    async def _query_entity_registry(self):
+        """Query HA's entity and device registries (see _load_entity_registry)."""
         from sonorium.ha.registry import WEBSOCKETS_AVAILABLE
 
         if not WEBSOCKETS_AVAILABLE:
@@ -536,19 +553,40 @@ class SonosPlayer:
             logger.debug(f"  SoCo: Traceback: {traceback.format_exc()}")
 
     async def _load_ha_device_ips(self):
-        """Load Sonos IPs from HA device registry (one-time)."""
-        if self._ha_ips_loaded:
+        """
+        Load Sonos IPs from HA device registry, refreshing after HA_DEVICE_IPS_TTL.
+
+        Concurrent callers wait for a single refresh. If a refresh finds nothing,
+        the previously loaded IPs are kept.
+        """
+        if time.monotonic() < self._ha_ips_expiry:
             return
 
-        self._ha_ips_loaded = True
-        self._ha_device_ips = await _get_sonos_ips_from_ha(self.media_controller)
+        async with self._ha_ips_lock:
+            # Another caller may have refreshed while we waited
+            if time.monotonic() < self._ha_ips_expiry:
+                return
+
+            device_ips = await _get_sonos_ips_from_ha(self.media_controller)
+            self._ha_ips_expiry = time.monotonic() + HA_DEVICE_IPS_TTL
 
-        if not self._ha_device_ips:
+        if device_ips:
+            self._ha_device_ips = device_ips
+        elif self._ha_device_ips:
+            logger.warning("  SoCo: HA registry refresh found no Sonos IPs, keeping previous results")
+        else:
             logger.warning("  SoCo: No Sonos IPs found in HA device registry")
             # Fall back to manual mappings if available
             if _manual_ip_map:
                 logger.info(f"  SoCo: Using {len(_manual_ip_map)} manual IP mapping(s)")
 
+    async def prewarm(self):
+        """Load HA registry data ahead of the first play request."""
+        try:
+            await asyncio.gather(self._load_entity_registry(), self._load_ha_device_ips())
+        except Exception as e:
+            logger.warning(f"  SoCo: Registry prewarm failed: {e}")
+
     async def get_sonos_ip(self, entity_id: str) -> Optional[str]:
         """
         Get IP address for a Sonos entity.
@@ -754,7 +792,7 @@ class SonosPlayer:
         """Clear the IP cache and registry caches, force reload from HA."""
         self._ip_cache.clear()
         self._ha_device_ips.clear()
-        self._ha_ips_loaded = False
+        self._ha_ips_expiry = 0.0
         self._entity_platforms.clear()
         self._entity_manufacturers.clear()
         self._registry_loaded = False
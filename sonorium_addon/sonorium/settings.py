@@ -227,7 +227,7 @@ class Settings(BaseSettings):
             path_audio_str=self.path_audio,
         )
 
-        client = ClientSonorium.from_supervisor(device=device)
+        client = await ClientSonorium.from_supervisor(device=device)
         await client.start()
 
 
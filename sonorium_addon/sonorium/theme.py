@@ -10,12 +10,14 @@ from sonorium.recording import LOG_THRESHOLD, ExclusionGroupCoordinator
 from sonorium.utils import IndexList
 
 
+# Runs of special chars and/or underscores, each collapsed to a single underscore
+_SANITIZE_RE = re.compile(r'(?:[^\w\-]|_)+')
+
+
 def sanitize(text: str) -> str:
     """Sanitize a string to be safe for use as an ID/filename."""
-    # Replace spaces and special chars with underscores
-    text = re.sub(r'[^\w\-]', '_', text.lower())
-    # Remove consecutive underscores
-    text = re.sub(r'_+', '_', text)
+    # Replace spaces and special chars with underscores, collapsing runs
+    text = _SANITIZE_RE.sub('_', text.lower())
     # Strip leading/trailing underscores
     return text.strip('_')
 
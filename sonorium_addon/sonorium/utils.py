@@ -1,6 +1,7 @@
 """
 Shared utility functions for Sonorium
 """
+import functools
 import os
 import re
 
@@ -13,6 +14,9 @@ class IndexList(list):
     """
     Simple list subclass that supports attribute-based indexing.
     Replaces fmtr.tools.iterator_tools.IndexList.
+
+    Lookups are memoized per attribute and dropped whenever the list is mutated,
+    so they assume indexed attributes (id, name, ...) don't change on the items.
     """
 
     def __init__(self, iterable=None):
@@ -24,15 +28,34 @@ class IndexList(list):
         if name.startswith('_'):
             raise AttributeError(name)
 
-        # Return a dict mapping the attribute value to the item
-        result = {}
-        for item in self:
-            if hasattr(item, name):
-                key = getattr(item, name)
-                result[key] = item
+        indices = self.__dict__.setdefault('_indices', {})
+        result = indices.get(name)
+        if result is None:
+            # Build a dict mapping the attribute value to the item
+            result = {}
+            for item in self:
+                if hasattr(item, name):
+                    key = getattr(item, name)
+                    result[key] = item
+            indices[name] = result
         return result
 
 
+def _invalidating(method):
+    """Wrap a list mutator so it drops memoized IndexList lookups."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        self.__dict__.pop('_indices', None)
+        return method(self, *args, **kwargs)
+    return wrapper
+
+
+for _name in ('append', 'extend', 'insert', 'remove', 'pop', 'clear', 'sort', 'reverse',
+              '__setitem__', '__delitem__', '__iadd__', '__imul__'):
+    setattr(IndexList, _name, _invalidating(getattr(list, _name)))
+del _name
+
+
 def sanitize(text: str) -> str:
     """Sanitize a string to be safe for use as an ID/filename."""
     # Replace spaces and special chars with underscores